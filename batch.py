@@ -0,0 +1,274 @@
+import argparse, importlib.util, itertools, json, random, sys, time
+from typing import Any, Dict, Iterator, List, Optional
+
+# Chỉ import thư viện chuẩn ở đây: mỗi engine tự import module của nó (bt4, bt2, counting,
+# simpleai, numpy) khi được chọn, nên một batch chỉ gồm engine thuần Python khởi động rất nhanh.
+
+# ================== Phần 1: Các engine ==================
+def _local_search(solver, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Chạy solve() của một solver trong bt4, trả về (nghiệm, số xung đột, số vòng lặp) dạng dict"""
+    solution, conflicts, iterations = solver.solve(**params)
+    return {'solution': solution, 'conflicts': conflicts, 'iterations': iterations}
+
+def _pop(params: Dict[str, Any], names) -> Dict[str, Any]:
+    """Tách các tham số dành cho hàm khởi tạo ra khỏi tham số của solve()"""
+    return {name: params.pop(name) for name in names if name in params}
+
+def run_hc(n, seed, params):
+    import bt4
+    return _local_search(bt4.HillClimbingWithValueOrdering(n), params)
+
+def run_hc_numpy(n, seed, params):
+    import bt4
+    return _local_search(bt4.HillClimbingWithValueOrdering(n), dict(params, vectorized=True))
+
+def run_sa(n, seed, params):
+    import bt4
+    return _local_search(bt4.SimulatedAnnealingWithValueOrdering(n), params)
+
+def run_ga(n, seed, params):
+    import bt4
+    init = _pop(params, ('population_size', 'mutation_rate', 'tournament_size'))
+    return _local_search(bt4.GeneticAlgorithmWithValueOrdering(n, **init), params)
+
+def run_tabu(n, seed, params):
+    import bt4
+    return _local_search(bt4.TabuSearch(n), params)
+
+def run_island_ga(n, seed, params):
+    import bt4
+    init = _pop(params, ('population_size', 'islands', 'migration_interval', 'migrants'))
+    return _local_search(bt4.IslandGeneticAlgorithm(n, seed=seed, **init), params)
+
+def run_hc_perm(n, seed, params):
+    import bt4
+    return _local_search(bt4.HillClimbingPermutation(n), params)
+
+def run_sa_perm(n, seed, params):
+    import bt4
+    return _local_search(bt4.SimulatedAnnealingPermutation(n), params)
+
+def run_ga_perm(n, seed, params):
+    import bt4
+    init = _pop(params, ('population_size', 'crossover_method'))
+    return _local_search(bt4.GeneticAlgorithmPermutation(n, **init), params)
+
+def run_mrv(n, seed, params):
+    import bt2
+    result = bt2.NativeMRVSolver(n, **params).solve()
+    solution = result['solution']
+    return {
+        'solution': [solution[f'Q{row}'] for row in range(n)] if solution else None,
+        'conflicts': 0 if solution else None,
+        'iterations': result['nodes'],
+    }
+
+def run_count(n, seed, params):
+    import counting, geometry
+    board = geometry.BoardGeometry.from_params(n, params)
+    if params.get('memoized'):
+        if not board.is_standard:
+            raise ValueError("MemoizedCounter chỉ hỗ trợ bàn cờ n x n thường")
+        total = counting.MemoizedCounter(n, params.get('split_depth')).count()
+    else:
+        total = counting.count_solutions(n, board)
+    return {'solution': None, 'count': total}
+
+def run_backtrack(n, seed, params):
+    import geometry
+    solution = geometry.first_solution(geometry.BoardGeometry.from_params(n, params))
+    return {'solution': solution, 'conflicts': 0 if solution else None, 'iterations': None}
+
+def run_min_conflicts(n, seed, params):
+    import geometry
+    board = geometry.BoardGeometry.from_params(n, params)
+    solution, conflicts, steps = geometry.MinConflicts(board).solve(**params)
+    return {'solution': solution, 'conflicts': conflicts, 'iterations': steps}
+
+def _run_csp(n, inference):
+    from simpleai.search import backtrack
+    import bt4
+    nqueens_csp = bt4.NQueensCSP(n)
+    solution = bt4.convert_csp_solution(backtrack(nqueens_csp.create_csp_problem(), inference=inference), n)
+    return {'solution': solution, 'conflicts': 0 if solution else None, 'iterations': None}
+
+def run_csp_mrv(n, seed, params):
+    import bt2
+    from simpleai.search import MOST_CONSTRAINED_VARIABLE
+    result = bt2.solve_and_measure(bt2.create_n_queens_problem(n),
+                                   variable_heuristic=MOST_CONSTRAINED_VARIABLE, inference=True)
+    solution = result['solution']
+    return {
+        'solution': [solution[f'Q{row}'] for row in range(n)] if solution else None,
+        'conflicts': 0 if solution else None,
+        'iterations': None,
+    }
+
+def run_csp(n, seed, params):
+    return _run_csp(n, inference=False)
+
+def run_csp_fc(n, seed, params):
+    return _run_csp(n, inference=True)
+
+# Tên engine -> (hàm chạy, các module được nạp trước khi chạy, các gói ngoài bắt buộc, mô tả)
+ENGINES = {
+    'hc': (run_hc, ('bt4',), (), "Hill climbing + value ordering (bt4)"),
+    'hc-numpy': (run_hc_numpy, ('bt4', 'numpy'), ('numpy',),
+                 "Hill climbing, chọn neighbor bằng ma trận delta NumPy (bt4)"),
+    'sa': (run_sa, ('bt4',), (), "Simulated annealing (bt4)"),
+    'ga': (run_ga, ('bt4',), (), "Genetic algorithm (bt4)"),
+    'tabu': (run_tabu, ('bt4',), (), "Tabu search (bt4)"),
+    'island-ga': (run_island_ga, ('bt4', 'multiprocessing'), (), "Island model GA, nhiều tiến trình (bt4)"),
+    'hc-perm': (run_hc_perm, ('bt4',), (), "Hill climbing trên hoán vị (bt4)"),
+    'sa-perm': (run_sa_perm, ('bt4',), (), "Simulated annealing trên hoán vị (bt4)"),
+    'ga-perm': (run_ga_perm, ('bt4',), (), "Genetic algorithm trên hoán vị (bt4)"),
+    'mrv': (run_mrv, ('bt2',), (), "Backtracking + forward checking, MRV bucket queue (bt2)"),
+    'count': (run_count, ('counting', 'geometry'), (), "Đếm số nghiệm bằng bitmask (counting, nhận hình học)"),
+    'backtrack': (run_backtrack, ('geometry',), (), "Quay lui bitmask, nghiệm đầu tiên (geometry)"),
+    'min-conflicts': (run_min_conflicts, ('geometry',), (), "Min-conflicts theo hình học bàn cờ (geometry)"),
+    'csp': (run_csp, ('bt4', 'simpleai.search'), ('simpleai',), "Backtracking CSP của simpleai (bt4)"),
+    'csp-fc': (run_csp_fc, ('bt4', 'simpleai.search'), ('simpleai',),
+               "Backtracking CSP của simpleai + inference (bt4)"),
+    'csp-mrv': (run_csp_mrv, ('bt2', 'simpleai.search'), ('simpleai',),
+                "Backtracking CSP của simpleai + MCV + forward checking (bt2)"),
+}
+
+def missing_requirements(algorithms) -> List[str]:
+    """Các gói ngoài cần cho `algorithms` nhưng chưa cài (kiểm tra mà không import)"""
+    required = {package for algorithm in algorithms for package in ENGINES[algorithm][2]}
+    return sorted(package for package in required if importlib.util.find_spec(package) is None)
+
+# ================== Phần 2: Đặc tả batch ==================
+def expand_spec(entry: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    '''
+    Một dòng đặc tả: {"n": ..., "algorithm": ..., "seed": ..., "params": {...}}.
+    n / algorithm / seed có thể là danh sách: sinh tích Descartes n x algorithm x seed.
+    Với count / backtrack / min-conflicts, params có thể mô tả hình học bàn cờ:
+    cols, blocked ([[hàng, cột], ...]), toroidal, queens_per_row (xem geometry.BoardGeometry).
+    '''
+    def as_list(value):
+        return value if isinstance(value, list) else [value]
+
+    for key in ('n', 'algorithm'):
+        if key not in entry:
+            raise ValueError(f"thiếu khoá '{key}' trong {entry}")
+
+    for n, algorithm, seed in itertools.product(as_list(entry['n']), as_list(entry['algorithm']),
+                                                as_list(entry.get('seed', 0))):
+        if algorithm not in ENGINES:
+            raise ValueError(f"Không có engine '{algorithm}' (có: {', '.join(ENGINES)})")
+        yield {'n': n, 'algorithm': algorithm, 'seed': seed, 'params': dict(entry.get('params', {}))}
+
+def read_spec(path: str) -> List[Dict[str, Any]]:
+    """Đọc file đặc tả JSON-lines ('-' là stdin), bỏ qua dòng trống và dòng bắt đầu bằng '#'"""
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        return [job for line in stream if line.strip() and not line.lstrip().startswith('#')
+                for job in expand_spec(json.loads(line))]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+# ================== Phần 3: Chạy batch ==================
+def load_engines(algorithms):
+    """Nạp module của các engine được chọn trước khi bấm giờ (chỉ các engine này, không nạp hết)"""
+    for algorithm in algorithms:
+        for module in ENGINES[algorithm][1]:
+            importlib.import_module(module)
+
+def run_job(job: Dict[str, Any], include_solution: bool = False, memory: bool = False,
+            top: int = 5) -> Dict[str, Any]:
+    '''
+    Chạy một job trong tiến trình hiện tại, trả về một bản ghi kết quả.
+    `memory=True`: chạy dưới tracemalloc (memprofile.measure), thêm peak_memory, allocations
+    và `top` vị trí cấp phát lớn nhất vào bản ghi; thời gian khi đó bị tracemalloc làm chậm.
+    '''
+    run = ENGINES[job['algorithm']][0]
+    random.seed(job['seed'])
+    start_time = time.time()
+    if memory:
+        import memprofile
+        result, memory_stats = memprofile.measure(run, job['n'], job['seed'], dict(job['params']), top=top)
+    else:
+        result = run(job['n'], job['seed'], dict(job['params']))
+    elapsed = time.time() - start_time
+
+    record = {'n': job['n'], 'algorithm': job['algorithm'], 'seed': job['seed']}
+    if job['params']:
+        record['params'] = job['params']
+    if 'count' in result:
+        record['count'] = result['count']
+    else:
+        record['solved'] = result['conflicts'] == 0
+        record['conflicts'] = result['conflicts']
+        record['iterations'] = result['iterations']
+    record['time'] = elapsed
+    if memory:
+        record.update(memory_stats)
+    if include_solution:
+        record['solution'] = result['solution']
+    return record
+
+def run_batch(jobs: List[Dict[str, Any]], out, include_solution: bool = False, memory: bool = False):
+    """Chạy lần lượt các job, ghi mỗi kết quả thành một dòng JSON ngay khi xong"""
+    load_engines({job['algorithm'] for job in jobs})
+    for job in jobs:
+        try:
+            record = run_job(job, include_solution, memory)
+        except (TypeError, ValueError, RuntimeError) as error:
+            # Tham số sai chỉ làm hỏng job này, các job còn lại của batch vẫn chạy tiếp
+            record = {'n': job['n'], 'algorithm': job['algorithm'], 'seed': job['seed'],
+                      'params': job['params'], 'error': str(error)}
+        out.write(json.dumps(record, ensure_ascii=False) + '\n')
+        out.flush()
+
+# ================== Phần 4: Khối thực thi chính ==================
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Chạy một batch N-Queens (n x thuật toán x seed) trong một tiến trình, "
+                                                 "ghi kết quả dạng JSON-lines")
+    parser.add_argument('--n', type=int, nargs='+', default=[8])
+    parser.add_argument('--algorithm', choices=list(ENGINES), nargs='+', default=['hc'])
+    parser.add_argument('--seed', type=int, nargs='+', default=[0])
+    parser.add_argument('--param', action='append', default=[], metavar='TÊN=GIÁ_TRỊ',
+                        help="tham số cho engine, giá trị đọc theo JSON (ví dụ max_iterations=5000)")
+    parser.add_argument('--spec', help="file đặc tả JSON-lines thay cho --n/--algorithm/--seed ('-' là stdin)")
+    parser.add_argument('--output', default='-', help="file kết quả JSON-lines (mặc định stdout)")
+    parser.add_argument('--solutions', action='store_true', help="ghi cả nghiệm vào kết quả")
+    parser.add_argument('--memory', action='store_true',
+                        help="đo bộ nhớ bằng tracemalloc: đỉnh bộ nhớ, số khối nhớ, vị trí cấp phát lớn nhất")
+    parser.add_argument('--list', action='store_true', help="liệt kê các engine rồi thoát")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, (_, _, requires, description) in ENGINES.items():
+            print(f"{name:<10} {description}" + (f" [cần {', '.join(requires)}]" if requires else ""))
+        return
+
+    try:
+        if args.spec:
+            jobs = read_spec(args.spec)
+        else:
+            params = {}
+            for item in args.param:
+                name, _, value = item.partition('=')
+                try:
+                    params[name] = json.loads(value)
+                except ValueError:
+                    params[name] = value # chuỗi không có dấu nháy, ví dụ crossover_method=ox
+            jobs = list(expand_spec({'n': args.n, 'algorithm': args.algorithm,
+                                     'seed': args.seed, 'params': params}))
+    except (OSError, ValueError) as error:
+        parser.error(f"đặc tả batch không hợp lệ: {error}")
+
+    missing = missing_requirements({job['algorithm'] for job in jobs})
+    if missing:
+        parser.error(f"chưa cài gói: {', '.join(missing)}")
+
+    if args.output == '-':
+        run_batch(jobs, sys.stdout, args.solutions, args.memory)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            run_batch(jobs, out, args.solutions, args.memory)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from simpleai.search import CspProblem, backtrack
 import time
+from render import write_board
 
 class NQueensCSP:
     def __init__(self, n=5):
@@ -62,14 +63,9 @@ class NQueensCSP:
         print("   " + " ".join([f"{i:2}" for i in range(self.n)]))
         print("  +" + "---" * self.n)
         
-        for row in range(self.n):
-            line = f"{row} |"
-            for col in range(self.n):
-                if solution[row] == col:
-                    line += " Q "
-                else:
-                    line += " . "
-            print(line)
+        # In từng hàng, không cộng chuỗi từng ô
+        write_board([solution[row] for row in range(self.n)], self.n,
+                    empty=" . ", queen=" Q ", sep="", prefix="{row} |")
         
         print(f"\n Vị trí các quân hậu: {[(row, solution[row]) for row in sorted(solution.keys())]}")
         print(f" Kiểm tra: {self.verify_solution(solution)}")
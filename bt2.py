@@ -1,12 +1,8 @@
 
 import time  
-from simpleai.search import (
-    CspProblem,  # Lớp cơ sở để định nghĩa một bài toán CSP
-    backtrack,  # Thuật toán giải CSP bằng phương pháp quay lui
-    MOST_CONSTRAINED_VARIABLE,  # Heuristic: ưu tiên biến có ít giá trị hợp lệ còn lại nhất
-    LEAST_CONSTRAINING_VALUE,  # Heuristic: ưu tiên giá trị loại bỏ ít lựa chọn nhất của các biến lân cận
-    HIGHEST_DEGREE_VARIABLE,  # Heuristic: ưu tiên biến có nhiều ràng buộc với các biến khác nhất
-)
+from render import write_board
+# simpleai chỉ được import trong các hàm dùng đến nó: NativeMRVSolver không cần simpleai,
+# nhờ vậy batch.py có thể nạp module này mà không tốn thời gian import simpleai.
 
 # ================== Phần 1: Định nghĩa bài toán N-Queens ==================
 def create_n_queens_problem(n=5):
@@ -17,6 +13,8 @@ def create_n_queens_problem(n=5):
     - Ràng buộc (Constraints): Các điều kiện để các quân hậu không "ăn" nhau.
     '''
     
+    from simpleai.search import CspProblem  # Lớp cơ sở để định nghĩa một bài toán CSP
+
     # Tạo danh sách các biến, mỗi biến tương ứng với một hàng trên bàn cờ.
     # Ví dụ với n=4, ta có ['Q0', 'Q1', 'Q2', 'Q3'].
     variables = [f'Q{i}' for i in range(n)]
@@ -63,6 +61,8 @@ def solve_and_measure(problem, variable_heuristic=None, value_heuristic=None, in
     - `value_heuristic`: Chiến lược chọn giá trị cho biến (ví dụ: LEAST_CONSTRAINING_VALUE).
     - `inference`: Bật/tắt suy luận (ví dụ: Forward Checking).
     '''
+    from simpleai.search import backtrack  # Thuật toán giải CSP bằng phương pháp quay lui
+
     # Ghi lại thời điểm bắt đầu.
     start_time = time.time()
     
@@ -83,6 +83,148 @@ def solve_and_measure(problem, variable_heuristic=None, value_heuristic=None, in
         'time': end_time - start_time,  # Thời gian thực thi
     }
 
+# ================== Phần 2b: MRV tự cài đặt (không dùng simpleai) ==================
+class NativeMRVSolver:
+    '''
+    Backtracking + forward checking cho N-Queens với heuristic MRV tự cài đặt.
+    MOST_CONSTRAINED_VARIABLE của simpleai phải quét lại mọi biến để tính kích thước miền giá trị
+    ở mỗi nút (HIGHEST_DEGREE_VARIABLE luôn hoà vì mọi hàng có cùng bậc n-1). Ở đây:
+    - `domains[r]`: bitmask các cột còn hợp lệ của hàng r, được cập nhật dần khi gán/quay lui.
+    - Bucket queue: `buckets[s]` chứa các hàng chưa gán có miền giá trị s cột, lưu dạng bitmask n bit
+      theo rank (rank nhỏ cho hàng gần giữa bàn cờ), nên bit thấp nhất của một bucket chính là hàng
+      được ưu tiên khi hoà. `min_size` là cận dưới của bucket nhỏ nhất còn hàng: giảm khi có hàng rơi
+      xuống bucket nhỏ hơn, được đẩy lên lúc chọn biến.
+    - Forward checking thu hẹp miền của hàng nào thì chỉ thêm hàng đó vào bucket mới, một phép OR trên
+      số nguyên n bit. Bit cũ ở bucket lớn hơn được để lại (xoá lười): lúc chọn biến, hàng nào có
+      kích thước miền thật khác chỉ số bucket thì bị xoá khỏi bucket đó và bỏ qua.
+    - Quay lui không phải sửa bucket: mỗi giá trị thử làm việc trên bản sao của `buckets`
+      (n + 1 số nguyên, sao chép ở mức C), thử xong thì bỏ bản sao đi.
+    - `variable_selection='scan'`: chọn biến bằng cách quét mọi hàng chưa gán (như simpleai),
+      dùng để so sánh chi phí chọn biến.
+    '''
+    def __init__(self, n=5, variable_selection='bucket'):
+        self.n = n
+        self.variable_selection = variable_selection
+        # Xếp hạng các hàng theo khoảng cách tới giữa bàn cờ
+        center = (n - 1) / 2
+        self.rows_by_rank = sorted(range(n), key=lambda r: (abs(r - center), r))
+        self.rank = [0] * n
+        for rank, row in enumerate(self.rows_by_rank):
+            self.rank[row] = rank
+        self.rank_bits = [1 << rank for rank in self.rank]
+
+    def select_variable(self):
+        if self.buckets is not None:
+            buckets, domains, rows_by_rank = self.buckets, self.domains, self.rows_by_rank
+            size = self.min_size
+            while True:
+                bucket = buckets[size]
+                while bucket:
+                    lowest = bucket & -bucket
+                    row = rows_by_rank[lowest.bit_length() - 1]
+                    if domains[row].bit_count() == size:
+                        buckets[size] = bucket
+                        self.min_size = size
+                        return row
+                    bucket ^= lowest
+                buckets[size] = 0
+                size += 1
+        return min(self.unassigned, key=lambda r: (self.domains[r].bit_count(), self.rank[r]))
+
+    def assign(self, row, col):
+        """Forward checking: loại các cột bị quân hậu (row, col) tấn công khỏi miền của các hàng chưa gán"""
+        bit = 1 << col
+        domains, trail, buckets, rank_bits = self.domains, self.trail, self.buckets, self.rank_bits
+        min_size = self.min_size
+        for other in self.unassigned:
+            distance = abs(other - row)
+            attacked = bit | (bit << distance) | (bit >> distance)
+            domain = domains[other]
+            if domain & attacked:
+                trail.append((other, domain))
+                reduced = domain & ~attacked
+                domains[other] = reduced
+                if buckets is not None:
+                    size = reduced.bit_count()
+                    buckets[size] |= rank_bits[other]
+                    if size < min_size:
+                        min_size = size
+                if not reduced:
+                    return False
+        self.min_size = min_size
+        return True
+
+    def undo(self, mark):
+        domains, trail = self.domains, self.trail
+        while len(trail) > mark:
+            row, domain = trail.pop()
+            domains[row] = domain
+
+    def search(self):
+        if not self.unassigned:
+            return True
+
+        start = time.perf_counter()
+        row = self.select_variable()
+        self.select_time += time.perf_counter() - start
+
+        # Bucket queue của nút này (không còn hàng vừa chọn); lời gọi cha sẽ bỏ nó sau khi quay lui
+        buckets, min_size = self.buckets, self.min_size
+        if buckets is not None:
+            buckets[self.domains[row].bit_count()] ^= self.rank_bits[row]
+        self.unassigned.remove(row)
+        domain = self.domains[row]
+        while domain:
+            bit = domain & -domain
+            domain ^= bit
+            self.nodes += 1
+            mark = len(self.trail)
+            if buckets is not None:
+                self.buckets, self.min_size = buckets[:], min_size
+            if self.assign(row, bit.bit_length() - 1):
+                self.assignment[row] = bit.bit_length() - 1
+                if self.search():
+                    return True
+            self.undo(mark)
+        self.unassigned.add(row)
+        return False
+
+    def solve(self):
+        '''
+        Trả về dictionary giống solve_and_measure, thêm:
+        - `select_time`: thời gian chọn biến (kể cả xoá lười các bit cũ). Việc thêm hàng vào bucket và
+          sao chép `buckets` nằm trong vòng lặp forward checking / thử giá trị (bấm giờ riêng từng lần
+          còn tốn hơn chính phép cập nhật) nên được tính vào `search_time`; so sánh hai cách chọn biến
+          bằng `time`.
+        - `search_time`: phần còn lại (gán, forward checking, quay lui).
+        - `nodes`: số lần thử gán một giá trị.
+        '''
+        self.domains = [(1 << self.n) - 1] * self.n
+        self.unassigned = set(range(self.n))
+        self.trail = []
+        self.assignment = {}
+        self.select_time = 0.0
+        self.nodes = 0
+
+        start_time = time.time()
+        self.buckets = self.min_size = None
+        if self.variable_selection == 'bucket':
+            # Ban đầu mọi hàng có miền đủ n cột, cùng nằm trong bucket n
+            self.buckets = [0] * (self.n + 1)
+            self.buckets[self.n] = (1 << self.n) - 1
+            self.min_size = self.n
+        found = self.search()
+        total_time = time.time() - start_time
+
+        solution = {f'Q{row}': col for row, col in self.assignment.items()} if found else None
+        return {
+            'solution': solution,
+            'time': total_time,
+            'select_time': self.select_time,
+            'search_time': total_time - self.select_time,
+            'nodes': self.nodes,
+        }
+
 # ================== Phần 3: Các hàm hiển thị kết quả ==================
 def print_solution_array(solution, n):
     '''
@@ -112,20 +254,22 @@ def print_board(solution, n):
         print("Không tìm thấy nghiệm để hiển thị bàn cờ.")
         return
 
-    # Tạo một bàn cờ rỗng.
-    board = [['.' for _ in range(n)] for _ in range(n)]
-    
-    # Đặt các quân hậu vào bàn cờ dựa trên nghiệm.
+    # Chuyển nghiệm sang mảng hàng -> cột (O(n), không tạo bàn cờ n x n).
+    positions = [0] * n
     for var, col in solution.items():
-        row = int(var[1:])
-        board[row][col] = 'Q'
+        positions[int(var[1:])] = col
 
-    # In bàn cờ ra màn hình.
-    for row_data in board:
-        print(' '.join(row_data))
+    # In bàn cờ ra màn hình từng hàng một (bàn cờ quá lớn sẽ được in tóm tắt).
+    write_board(positions, n)
 
 # ================== Phần 4: Khối thực thi chính ==================
 if __name__ == "__main__":
+    from simpleai.search import (
+        MOST_CONSTRAINED_VARIABLE,  # Heuristic: ưu tiên biến có ít giá trị hợp lệ còn lại nhất
+        LEAST_CONSTRAINING_VALUE,  # Heuristic: ưu tiên giá trị loại bỏ ít lựa chọn nhất của các biến lân cận
+        HIGHEST_DEGREE_VARIABLE,  # Heuristic: ưu tiên biến có nhiều ràng buộc với các biến khác nhất
+    )
+
     N = 5 
     print(f"=== Giải bài toán N-Queens với N={N} ===\n")
 
@@ -175,6 +319,26 @@ if __name__ == "__main__":
         # Lưu lại kết quả để so sánh cuối cùng.
         results.append((name, result['time']))
 
+    # --- MRV tự cài đặt: tách chi phí chọn biến khỏi chi phí tìm kiếm ---
+    print(f"\nĐang chạy chiến lược: Native MRV (bucket queue)")
+    result = NativeMRVSolver(N).solve()
+    print(f"Thời gian: {result['time']:.6f}s (chọn biến: {result['select_time']:.6f}s)")
+    print_solution_array(result['solution'], N)
+    print_board(result['solution'], N)
+    results.append(("Native MRV (bucket queue)", result['time']))
+
+    print("\n\n=== Chi phí chọn biến: bucket queue vs quét mọi biến ===")
+    # Cập nhật bucket nằm trong forward checking nên thuộc cột Tìm kiếm; so sánh bằng cột Tổng.
+    # Lấy lần chạy nhanh nhất trong vài lần để bớt nhiễu với n nhỏ (chạy dưới 1 ms).
+    print(f"{'N':>4} | {'Cách chọn':<8} | {'Số nút':>7} | {'Chọn biến (s)':>13} | {'Tìm kiếm (s)':>12} | {'Tổng (s)':>9}")
+    print("-" * 70)
+    for n in (N, 30, 60, 100):
+        for selection in ('bucket', 'scan'):
+            result = min((NativeMRVSolver(n, variable_selection=selection).solve()
+                          for _ in range(5 if n <= 60 else 1)), key=lambda r: r['time'])
+            print(f"{n:>4} | {selection:<8} | {result['nodes']:>7} | "
+                  f"{result['select_time']:>13.6f} | {result['search_time']:>12.6f} | {result['time']:>9.6f}")
+
     print("\n\n=== Bảng so sánh hiệu quả các chiến lược ===")
     print(f"{'Chiến lược':<35} | {'Thời gian (giây)':<10}")
     print("-" * 55)
@@ -1,5 +1,6 @@
 from simpleai.search import CspProblem, backtrack
 import time
+from render import write_board
 class NQueensProblem(CspProblem):
     """
     Bai toan N-Queens su dung CSP
@@ -61,17 +62,14 @@ class NQueensProblem(CspProblem):
         print(f"\nNghiem tim duoc:")
         print("=" * (self.n * 4 + 1))
         
-        board = [['.' for _ in range(self.n)] for _ in range(self.n)]
-        
-        # Dat quan hau len ban co
+        # Vi tri quan hau theo hang (O(n), khong tao ban co n x n)
+        positions = [0] * self.n
         for var, col in solution.items():
-            row = int(var[1])  # Q0 -> hang 0, Q1 -> hang 1, ...
-            board[row][col] = 'Q'
+            positions[int(var[1:])] = col  # Q0 -> hang 0, Q1 -> hang 1, ...
         
-        # In ban co
-        for i, row in enumerate(board):
-            print(f"{i} | {' | '.join(row)} |")
-            print("  " + "+" + "---+" * self.n)
+        # In ban co tung hang mot
+        write_board(positions, self.n, sep=" | ", prefix="{row} | ", suffix=" |",
+                    row_separator="  " + "+" + "---+" * self.n)
         
         print("   ", end="")
         for j in range(self.n):
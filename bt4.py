@@ -1,28 +1,171 @@
-import random, math, time
+import random, math, time, os, json, functools
+from array import array
 from typing import List, Tuple, Dict, Any
-from simpleai.search import CspProblem, backtrack
-from simpleai.search.csp import MOST_CONSTRAINED_VARIABLE, LEAST_CONSTRAINING_VALUE
+from render import write_board
+# simpleai, multiprocessing và numpy chỉ được import trong hàm cần đến chúng,
+# để các engine thuần Python (batch.py) khởi động nhanh
+
+# Tham số mặc định của SA / GA; tuner.py ghi tham số đã tinh chỉnh theo từng n vào TUNED_PARAMS_FILE
+SA_DEFAULTS = {'initial_temp': 100, 'cooling_rate': 0.95, 'min_temp': 0.01}
+GA_DEFAULTS = {'population_size': 50, 'mutation_rate': 0.1, 'tournament_size': 3}
+TUNED_PARAMS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tuned_params.json')
+
+@functools.lru_cache(maxsize=None)
+def _read_tuned_params(path: str, mtime: float) -> Dict[str, Any]:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def load_tuned_params(solver: str, n: int, defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """Tham số đã tinh chỉnh cho (solver, n); chưa có thì dùng `defaults`"""
+    params = dict(defaults)
+    try:
+        tuned = _read_tuned_params(TUNED_PARAMS_FILE, os.path.getmtime(TUNED_PARAMS_FILE))
+    except (OSError, ValueError):
+        return params
+    params.update(tuned.get(solver, {}).get(str(n), {}).get('params', {}))
+    return params
+
+class BoardState:
+    """
+    Trạng thái bàn cờ gọn cho các thuật toán tìm kiếm cục bộ:
+    hàng của mỗi cột lưu trong array('I') cùng bộ đếm hàng/đường chéo và số conflicts,
+    di chuyển/hoàn tác tại chỗ thay vì tạo list mới sau mỗi bước.
+    """
+    __slots__ = ('n', 'rows', 'row_counts', 'diag1', 'diag2', 'conflicts', '_last')
+
+    def __init__(self, rows):
+        self.rows = array('I', rows)
+        self.n = n = len(self.rows)
+        self.row_counts = array('I', bytes(4 * n))
+        self.diag1 = array('I', bytes(4 * (2 * n - 1))) # đường chéo row - col (dịch thêm n - 1)
+        self.diag2 = array('I', bytes(4 * (2 * n - 1))) # đường chéo row + col
+        for col in range(n):
+            row = self.rows[col]
+            self.row_counts[row] += 1
+            self.diag1[row - col + n - 1] += 1
+            self.diag2[row + col] += 1
+        self.conflicts = sum(count * (count - 1) // 2
+                             for counts in (self.row_counts, self.diag1, self.diag2)
+                             for count in counts)
+        self._last = None
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, col):
+        return self.rows[col]
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __repr__(self):
+        return f"BoardState({self.rows.tolist()})"
+
+    def tolist(self) -> List[int]:
+        return self.rows.tolist()
+
+    def copy(self) -> 'BoardState':
+        """Sao chép cả bộ đếm (không cần tính lại)"""
+        board = BoardState.__new__(BoardState)
+        board.n = self.n
+        board.rows = array('I', self.rows)
+        board.row_counts = array('I', self.row_counts)
+        board.diag1 = array('I', self.diag1)
+        board.diag2 = array('I', self.diag2)
+        board.conflicts = self.conflicts
+        board._last = None
+        return board
+
+    def attacks(self, col: int, row: int) -> int:
+        """Số quân hậu (không tính quân ở cột col) tấn công ô (row, col)"""
+        own = 3 if self.rows[col] == row else 0
+        return self.row_counts[row] + self.diag1[row - col + self.n - 1] + self.diag2[row + col] - own
+
+    def delta(self, col: int, row: int) -> int:
+        """Độ thay đổi conflicts nếu chuyển quân hậu ở cột col sang hàng row (O(1))"""
+        old = self.rows[col]
+        if row == old:
+            return 0
+        return self.attacks(col, row) - self.attacks(col, old)
+
+    def _place(self, col: int, row: int, step: int):
+        self.row_counts[row] += step
+        self.diag1[row - col + self.n - 1] += step
+        self.diag2[row + col] += step
+
+    def move(self, col: int, row: int) -> int:
+        """Chuyển quân hậu ở cột col sang hàng row, trả về độ thay đổi conflicts"""
+        old = self.rows[col]
+        delta = self.delta(col, row)
+        self._place(col, old, -1)
+        self._place(col, row, 1)
+        self.rows[col] = row
+        self.conflicts += delta
+        self._last = (col, old, False)
+        return delta
+
+    def swap(self, i: int, j: int) -> int:
+        """Đổi hàng của hai cột i, j; số quân hậu mỗi hàng không đổi nên chỉ cập nhật đường chéo"""
+        n = self.n
+        diag1, diag2 = self.diag1, self.diag2
+        row_i, row_j = self.rows[i], self.rows[j]
+        delta = 0
+        # Nhấc hai quân hậu ra khỏi đường chéo cũ
+        for col, row in ((i, row_i), (j, row_j)):
+            diag1[row - col + n - 1] -= 1
+            diag2[row + col] -= 1
+            delta -= diag1[row - col + n - 1] + diag2[row + col]
+        # Đặt lại vào đường chéo mới
+        for col, row in ((i, row_j), (j, row_i)):
+            delta += diag1[row - col + n - 1] + diag2[row + col]
+            diag1[row - col + n - 1] += 1
+            diag2[row + col] += 1
+        self.rows[i], self.rows[j] = row_j, row_i
+        self.conflicts += delta
+        self._last = (i, j, True)
+        return delta
+
+    def undo(self):
+        """Hoàn tác bước move/swap gần nhất"""
+        if self._last is None:
+            return
+        first, second, is_swap = self._last
+        if is_swap:
+            self.swap(first, second)
+        else:
+            self.move(first, second)
+        self._last = None
+
+    def attacked_columns(self) -> List[int]:
+        """Các cột có quân hậu đang bị tấn công"""
+        return [col for col in range(self.n) if self.attacks(col, self.rows[col]) > 0]
 
 class NQueensBase:
     def __init__(self, n: int = 5):
         self.n = n
+    def line_counts(self, state: List[int]) -> Tuple[List[int], List[int], List[int]]:
+        """Đếm số quân hậu trên mỗi hàng và mỗi đường chéo"""
+        rows = [0] * self.n
+        diag1 = [0] * (2 * self.n - 1) # đường chéo row - col (dịch thêm n - 1)
+        diag2 = [0] * (2 * self.n - 1) # đường chéo row + col
+        for col in range(self.n):
+            row = state[col]
+            rows[row] += 1
+            diag1[row - col + self.n - 1] += 1
+            diag2[row + col] += 1
+        return rows, diag1, diag2
     def conflicts(self, state: List[int]) -> int:
         """Đếm số cặp quân hậu tấn công nhau"""
-        conflicts = 0
-        for i in range(self.n):
-            for j in range(i + 1, self.n):
-                if (state[i] == state[j] or 
-                    abs(state[i] - state[j]) == abs(i - j)): #cùng hàng hoặc cùng dường chéo
-                    conflicts += 1
-        return conflicts
+        if isinstance(state, BoardState):
+            return state.conflicts
+        # k quân hậu trên cùng một hàng/đường chéo tạo ra k(k-1)/2 cặp tấn công nhau
+        return sum(count * (count - 1) // 2
+                   for counts in self.line_counts(state) for count in counts)
     def print_board(self, state: List[int]):
         """In bàn cờ N-Queens"""
         print(f"\nBàn cờ {self.n}-Queens:")
-        for row in range(self.n):
-            line = ""
-            for col in range(self.n):
-                line += "Q " if state[col] == row else ". "
-            print(line)
+        # state[col] = row: in từng hàng, bàn cờ lớn được tóm tắt
+        write_board(state, self.n, by_column=True, empty=". ", queen="Q ", sep="")
         print()
 
 class NQueensCSP(NQueensBase):
@@ -45,6 +188,7 @@ class NQueensCSP(NQueensBase):
                 abs(row1 - row2) != abs(col1 - col2))
     def create_csp_problem(self):
         """Tạo CSP problem với tất cả constraints"""
+        from simpleai.search import CspProblem
         constraints = []
         # Tạo constraint cho mọi cặp quân hậu
         for i in range(self.n):
@@ -119,37 +263,39 @@ class NQueensOptimization(NQueensBase):
 class HillClimbingWithValueOrdering(NQueensOptimization):
     """Hill Climbing với Value Ordering"""
     
-    def solve(self, max_iterations: int = 1000) -> Tuple[List[int], int, int]:
+    def solve(self, max_iterations: int = 1000, vectorized: bool = False) -> Tuple[List[int], int, int]:
+        """`vectorized=True`: tìm neighbor tốt nhất bằng ma trận delta NumPy (cần numpy)"""
         current = self.generate_initial_state_with_value_ordering()
         current_value = self.value_function(current)
+        get_best_neighbor = (self.get_best_neighbor_vectorized if vectorized
+                             else self.get_best_neighbor_with_ordering)
         
         for iteration in range(max_iterations):
             if self.conflicts(current) == 0:
-                return current, self.conflicts(current), iteration
+                return current.tolist(), self.conflicts(current), iteration
             
-            # Tìm neighbor tốt nhất sử dụng value ordering
-            best_neighbor = self.get_best_neighbor_with_ordering(current)
-            best_value = self.value_function(best_neighbor)
+            # Chuyển tại chỗ sang neighbor tốt nhất sử dụng value ordering
+            get_best_neighbor(current)
+            best_value = self.value_function(current)
             
             if best_value <= current_value:
+                current.undo()
                 break  # Local maximum
             
-            current = best_neighbor
             current_value = best_value
         
-        return current, self.conflicts(current), iteration
+        return current.tolist(), self.conflicts(current), iteration
     
-    def generate_initial_state_with_value_ordering(self) -> List[int]:
+    def generate_initial_state_with_value_ordering(self) -> BoardState:
         """Tạo trạng thái ban đầu sử dụng value ordering"""
-        state = [0] * self.n #tạm thời đặt tất cả hậu ở hàng 0
+        state = BoardState([0] * self.n) #tạm thời đặt tất cả hậu ở hàng 0
+        max_pairs = self.n * (self.n - 1) // 2
         
         for col in range(self.n):
-            # Tính điểm cho mỗi vị trí có thể
+            # Tính điểm cho mỗi vị trí có thể (delta O(1), không cần tạo trạng thái tạm thời)
             position_scores = []
             for row in range(self.n):
-                temp_state = state.copy() #tạo trạng thái tạm thời
-                temp_state[col] = row #thử đặt hậu ở hàng row
-                score = self.value_function(temp_state) #tính điểm cho vị trí này
+                score = max_pairs - state.conflicts - state.delta(col, row) #điểm nếu đặt hậu ở hàng row
                 position_scores.append((row, score)) #lưu lại vị trí và điểm
             
             # Sắp xếp theo điểm và chọn trong top 3
@@ -158,34 +304,72 @@ class HillClimbingWithValueOrdering(NQueensOptimization):
             
             # Chọn ngẫu nhiên trong top positions
             chosen_row = random.choice(top_positions)[0]
-            state[col] = chosen_row
+            state.move(col, chosen_row)
         
         return state
     
-    def get_best_neighbor_with_ordering(self, state: List[int]) -> List[int]:
-        """Tìm neighbor tốt nhất với value ordering"""
-        neighbors_with_values = []
+    def get_best_neighbor_with_ordering(self, state: BoardState) -> BoardState:
+        """
+        Tìm neighbor tốt nhất với value ordering và chuyển `state` sang đó tại chỗ
+        (gọi state.undo() để quay lại)
+        """
+        best_move, best_delta = None, None
         
         for col in range(self.n):
             for row in range(self.n):
                 if row != state[col]:
-                    neighbor = state.copy()
-                    neighbor[col] = row
-                    value = self.value_function(neighbor)
-                    neighbors_with_values.append((neighbor, value))
+                    delta = state.delta(col, row)
+                    if best_delta is None or delta < best_delta:
+                        best_move, best_delta = (col, row), delta
         
-        if not neighbors_with_values:
+        if best_move is not None:
+            state.move(*best_move)
+        return state
+    
+    def get_best_neighbor_vectorized(self, state: BoardState) -> BoardState:
+        """
+        Steepest ascent vector hoá: tính cả ma trận delta n x n (cột x hàng) trong một lượt NumPy
+        từ bộ đếm hàng/đường chéo của `state`, chọn ngẫu nhiên một trong các bước tốt nhất
+        và chuyển `state` sang đó tại chỗ. O(n^2) phép tính vector thay vì O(n^4) vòng lặp Python.
+        """
+        import numpy as np
+        n = self.n
+        if n < 2:
             return state
+        cols = np.arange(n)
+        indices = getattr(self, '_diagonal_indices', None)
+        if indices is None or indices[0].shape[0] != n:
+            # indices[0][c, r] = r - c + n - 1, indices[1][c, r] = r + c
+            indices = self._diagonal_indices = (cols[None, :] - cols[:, None] + n - 1,
+                                                cols[None, :] + cols[:, None])
+        # Xem trực tiếp bộ nhớ array('I') của BoardState (uint32), không sao chép
+        rows = np.frombuffer(state.rows, dtype=np.uint32)
+        row_counts = np.frombuffer(state.row_counts, dtype=np.uint32)
+        diag1 = np.frombuffer(state.diag1, dtype=np.uint32)
+        diag2 = np.frombuffer(state.diag2, dtype=np.uint32)
         
-        # Sắp xếp theo value và trả về neighbor tốt nhất
-        neighbors_with_values.sort(key=lambda x: x[1], reverse=True)
-        return neighbors_with_values[0][0]
+        # attacks[c, r]: số quân hậu tấn công ô (r, c), tính cả quân ở cột c nếu đang ở hàng r.
+        # Chỉ ép kiểu ma trận tổng sang int64 (delta có thể âm)
+        attacks = (row_counts[None, :] + diag1[indices[0]] + diag2[indices[1]]).astype(np.int64)
+        current_attacks = attacks[cols, rows] - 3
+        deltas = attacks - current_attacks[:, None]
+        deltas[cols, rows] = np.iinfo(np.int64).max # bỏ qua việc đứng yên
+        
+        best_cols, best_rows = np.nonzero(deltas == deltas.min())
+        choice = random.randrange(len(best_cols))
+        state.move(int(best_cols[choice]), int(best_rows[choice]))
+        return state
 
 class SimulatedAnnealingWithValueOrdering(NQueensOptimization):
     """Simulated Annealing với Value Ordering"""
     
-    def solve(self, initial_temp: float = 100, cooling_rate: float = 0.95, 
-              min_temp: float = 0.01) -> Tuple[List[int], int, int]:
+    def solve(self, initial_temp: float = None, cooling_rate: float = None, 
+              min_temp: float = None) -> Tuple[List[int], int, int]:
+        # Tham số không truyền vào: lấy từ kết quả tinh chỉnh (tuner.py) hoặc SA_DEFAULTS
+        params = load_tuned_params('SA', self.n, SA_DEFAULTS)
+        initial_temp = params['initial_temp'] if initial_temp is None else initial_temp
+        cooling_rate = params['cooling_rate'] if cooling_rate is None else cooling_rate
+        min_temp = params['min_temp'] if min_temp is None else min_temp
         current = self.generate_initial_state_with_value_ordering()
         current_value = self.value_function(current)
         
@@ -194,65 +378,60 @@ class SimulatedAnnealingWithValueOrdering(NQueensOptimization):
         
         while temperature > min_temp:
             if self.conflicts(current) == 0:
-                return current, self.conflicts(current), iteration
+                return current.tolist(), self.conflicts(current), iteration
             
-            # Tạo neighbor sử dụng value-based selection
-            neighbor = self.get_neighbor_with_value_ordering(current, temperature)
-            neighbor_value = self.value_function(neighbor)
+            # Chuyển tại chỗ sang neighbor sử dụng value-based selection
+            self.get_neighbor_with_value_ordering(current, temperature)
+            neighbor_value = self.value_function(current)
             
             # Acceptance probability
             delta = neighbor_value - current_value
             if delta > 0 or random.random() < math.exp(delta / temperature):
-                current = neighbor
                 current_value = neighbor_value
+            else:
+                current.undo()
             
             temperature *= cooling_rate
             iteration += 1
         
-        return current, self.conflicts(current), iteration
+        return current.tolist(), self.conflicts(current), iteration
     
-    def generate_initial_state_with_value_ordering(self) -> List[int]:
+    def generate_initial_state_with_value_ordering(self) -> BoardState:
         """Tái sử dụng hàm tạo trạng thái ban đầu từ Hill Climbing"""
         return HillClimbingWithValueOrdering(self.n).generate_initial_state_with_value_ordering()
     
-    def get_neighbor_with_value_ordering(self, state: List[int], temperature: float) -> List[int]:
-        """Tạo neighbor với bias theo value function"""
-        neighbor = state.copy()
+    def get_neighbor_with_value_ordering(self, state: BoardState, temperature: float) -> BoardState:
+        """Chuyển `state` tại chỗ sang một neighbor với bias theo value function"""
         col = random.randint(0, self.n - 1)
         
-        # Tính xác suất cho mỗi hàng
-        row_probabilities = []
-        for row in range(self.n):
-            temp_state = state.copy()
-            temp_state[col] = row
-            value = self.value_function(temp_state)
-            # Probability tỷ lệ thuận với value và temperature
-            prob = math.exp(value / max(temperature, 0.1))
-            row_probabilities.append((row, prob))
-        
-        # Chuẩn hóa xác suất
-        total_prob = sum(prob for _, prob in row_probabilities)
-        if total_prob > 0:
-            normalized_probs = [(row, prob / total_prob) for row, prob in row_probabilities]
-            
-            # Chọn hàng dựa trên xác suất
-            rand_val = random.random()
-            cumulative = 0
-            for row, prob in normalized_probs:
-                cumulative += prob
-                if rand_val <= cumulative:
-                    neighbor[col] = row
-                    break
-        else:
-            neighbor[col] = random.randint(0, self.n - 1)
+        # Tính xác suất cho mỗi hàng: value = max_pairs - conflicts, nên
+        # exp(value / T) tỷ lệ với exp(-delta / T); trừ delta nhỏ nhất để tránh tràn số
+        temperature = max(temperature, 0.1)
+        deltas = [state.delta(col, row) for row in range(self.n)]
+        best_delta = min(deltas)
+        probabilities = [math.exp((best_delta - delta) / temperature) for delta in deltas]
+        
+        # Chọn hàng dựa trên xác suất
+        rand_val = random.random() * sum(probabilities)
+        cumulative = 0
+        for row, prob in enumerate(probabilities):
+            cumulative += prob
+            if rand_val <= cumulative:
+                break
+        state.move(col, row)
         
-        return neighbor
+        return state
 
 class GeneticAlgorithmWithValueOrdering(NQueensOptimization):
     """Genetic Algorithm với Value Ordering"""
-    def __init__(self, n: int = 5, population_size: int = 50):
+    def __init__(self, n: int = 5, population_size: int = None,
+                 mutation_rate: float = None, tournament_size: int = None):
         super().__init__(n)
-        self.population_size = population_size
+        # Tham số không truyền vào: lấy từ kết quả tinh chỉnh (tuner.py) hoặc GA_DEFAULTS
+        params = load_tuned_params('GA', n, GA_DEFAULTS)
+        self.population_size = params['population_size'] if population_size is None else population_size
+        self.mutation_rate = params['mutation_rate'] if mutation_rate is None else mutation_rate
+        self.tournament_size = params['tournament_size'] if tournament_size is None else tournament_size
     
     def solve(self, generations: int = 500) -> Tuple[List[int], int, int]:
         # Tạo population ban đầu sử dụng value ordering 
@@ -270,23 +449,27 @@ class GeneticAlgorithmWithValueOrdering(NQueensOptimization):
                 return best_individual, self.conflicts(best_individual), generation
             
             # Tạo thế hệ mới
-            new_population = []
-            for _ in range(self.population_size // 2):
-                parent1 = self.selection_with_value_ordering(population, fitnesses)
-                parent2 = self.selection_with_value_ordering(population, fitnesses)
-                
-                child1, child2 = self.crossover(parent1, parent2)
-                child1 = self.mutate_with_value_ordering(child1)
-                child2 = self.mutate_with_value_ordering(child2)
-                
-                new_population.extend([child1, child2])
-            
-            population = new_population[:self.population_size]
+            population = self.next_generation(population, fitnesses)
         
         fitnesses = [self.value_function(individual) for individual in population]
         best_individual = population[fitnesses.index(max(fitnesses))]
         return best_individual, self.conflicts(best_individual), generations
     
+    def next_generation(self, population: List[List[int]], fitnesses: List[float]) -> List[List[int]]:
+        """Selection + crossover + mutation để tạo ra thế hệ tiếp theo"""
+        new_population = []
+        for _ in range(self.population_size // 2):
+            parent1 = self.selection_with_value_ordering(population, fitnesses)
+            parent2 = self.selection_with_value_ordering(population, fitnesses)
+            
+            child1, child2 = self.crossover(parent1, parent2)
+            child1 = self.mutate_with_value_ordering(child1)
+            child2 = self.mutate_with_value_ordering(child2)
+            
+            new_population.extend([child1, child2])
+        
+        return new_population[:self.population_size]
+    
     def create_initial_population_with_ordering(self) -> List[List[int]]:
         """Tạo population ban đầu với value ordering"""
         population = []
@@ -294,15 +477,14 @@ class GeneticAlgorithmWithValueOrdering(NQueensOptimization):
         
         for _ in range(self.population_size):
             individual = hc_helper.generate_initial_state_with_value_ordering()
-            population.append(individual)
+            population.append(individual.tolist())
         
         return population
     
     def selection_with_value_ordering(self, population: List[List[int]], fitnesses: List[float]) -> List[int]:
         """Tournament selection với bias theo value"""
-        tournament_size = 3
         tournament_indices = random.sample(range(len(population)), 
-                                         min(tournament_size, len(population)))
+                                         min(self.tournament_size, len(population)))
         tournament = [(population[i], fitnesses[i]) for i in tournament_indices]
         return max(tournament, key=lambda x: x[1])[0]
     
@@ -319,27 +501,398 @@ class GeneticAlgorithmWithValueOrdering(NQueensOptimization):
         
         return child1, child2
     
-    def mutate_with_value_ordering(self, individual: List[int], mutation_rate: float = 0.1) -> List[int]:
+    def mutate_with_value_ordering(self, individual: List[int], mutation_rate: float = None) -> List[int]:
         """Mutation với value-based bias"""
-        mutated = individual.copy()
+        if mutation_rate is None:
+            mutation_rate = self.mutation_rate
+        mutated = None
         
         for i in range(self.n):
             if random.random() < mutation_rate:
-                # Thử các giá trị và chọn tốt nhất
-                best_value = -1
-                best_row = mutated[i]
-                
-                for row in range(self.n):
-                    temp_individual = mutated.copy()
-                    temp_individual[i] = row
-                    value = self.value_function(temp_individual)
-                    
-                    if value > best_value:
-                        best_value = value
-                        best_row = row
-                mutated[i] = best_row
+                if mutated is None:
+                    mutated = BoardState(individual)
+                # Thử các giá trị và chọn tốt nhất (hàng đầu tiên có delta nhỏ nhất)
+                deltas = [mutated.delta(i, row) for row in range(self.n)]
+                mutated.move(i, deltas.index(min(deltas)))
         
-        return mutated
+        return individual if mutated is None else mutated.tolist()
+
+class TabuSearch(NQueensOptimization):
+    """
+    Tabu Search: luôn đi sang neighbor tốt nhất (kể cả khi tệ hơn) nên không dừng
+    ở cực đại cục bộ như Hill Climbing; các bước vừa đi bị cấm quay lại trong một thời gian.
+    """
+
+    def solve(self, max_iterations: int = 1000, tabu_tenure: int = None) -> Tuple[List[int], int, int]:
+        if tabu_tenure is None:
+            tabu_tenure = max(2, self.n // 4)
+        current = HillClimbingWithValueOrdering(self.n).generate_initial_state_with_value_ordering()
+        best_state, best_conflicts = current.tolist(), current.conflicts
+        # (cột, hàng) -> vòng lặp cuối cùng mà bước đặt quân hậu cột đó về hàng đó còn bị cấm
+        tabu = {}
+
+        for iteration in range(max_iterations):
+            if current.conflicts == 0:
+                return current.tolist(), 0, iteration
+
+            best_moves, best_delta = [], None
+            for col in current.attacked_columns():
+                for row in range(self.n):
+                    if row == current[col]:
+                        continue
+                    delta = current.delta(col, row)
+                    # Aspiration: bước bị cấm vẫn được chấp nhận nếu cho kết quả tốt nhất từ trước tới nay
+                    if tabu.get((col, row), -1) >= iteration and current.conflicts + delta >= best_conflicts:
+                        continue
+                    if best_delta is None or delta < best_delta:
+                        best_moves, best_delta = [(col, row)], delta
+                    elif delta == best_delta:
+                        best_moves.append((col, row))
+
+            if not best_moves:
+                continue  # Mọi bước đều bị cấm: chờ danh sách tabu hết hạn
+
+            col, row = random.choice(best_moves)
+            tabu[(col, current[col])] = iteration + tabu_tenure # cấm quay lại vị trí cũ
+            current.move(col, row)
+
+            if current.conflicts < best_conflicts:
+                best_state, best_conflicts = current.tolist(), current.conflicts
+
+        return best_state, best_conflicts, max_iterations
+
+def _run_island(index, n, population_size, generations, migration_interval, migrants,
+                seed, inbox, outbox, stop, results):
+    """Tiến trình con: tiến hoá một đảo, gửi cá thể tốt nhất sang đảo kế tiếp theo vòng"""
+    import queue
+    random.seed(None if seed is None else seed + index) # mỗi đảo một dãy ngẫu nhiên riêng
+    inbox.cancel_join_thread()
+    outbox.cancel_join_thread()
+
+    ga = GeneticAlgorithmWithValueOrdering(n, population_size)
+    population = ga.create_initial_population_with_ordering()
+    max_fitness = n * (n - 1) // 2
+
+    for generation in range(generations):
+        fitnesses = [ga.value_function(individual) for individual in population]
+        best_fitness = max(fitnesses)
+        if best_fitness == max_fitness:
+            stop.set() # báo cho các đảo khác dừng lại
+            break
+        if stop.is_set():
+            break
+
+        if migrants > 0 and generation > 0 and generation % migration_interval == 0:
+            ranked = sorted(range(len(population)), key=lambda i: fitnesses[i])
+            outbox.put([population[i] for i in ranked[len(ranked) - migrants:]])
+            # Nhận di dân (không chờ): thay thế các cá thể kém nhất
+            while not inbox.empty():
+                try:
+                    incoming = inbox.get_nowait()
+                except queue.Empty:
+                    break
+                for i, individual in zip(ranked, incoming):
+                    population[i] = individual
+                    fitnesses[i] = ga.value_function(individual)
+                # Xếp hạng lại để đợt di dân sau thay các cá thể kém nhất hiện tại, không đè lên đợt trước
+                ranked = sorted(range(len(population)), key=lambda i: fitnesses[i])
+
+        population = ga.next_generation(population, fitnesses)
+    else:
+        generation = generations
+        fitnesses = [ga.value_function(individual) for individual in population]
+
+    best_individual = population[fitnesses.index(max(fitnesses))]
+    results.put((index, best_individual, ga.conflicts(best_individual), generation))
+
+class IslandGeneticAlgorithm(NQueensOptimization):
+    """
+    Island model GA: nhiều quần thể tiến hoá song song trong các tiến trình riêng,
+    cứ `migration_interval` thế hệ lại gửi `migrants` cá thể tốt nhất sang đảo kế tiếp (vòng tròn).
+    Dừng tất cả các đảo ngay khi một đảo tìm được nghiệm.
+    """
+    def __init__(self, n: int = 5, population_size: int = 40, islands: int = None,
+                 migration_interval: int = 10, migrants: int = 2, seed: int = None):
+        super().__init__(n)
+        self.population_size = population_size
+        self.islands = (os.cpu_count() or 1) if islands is None else islands
+        if self.islands < 1:
+            raise ValueError("islands phải >= 1")
+        if migration_interval < 1:
+            raise ValueError("migration_interval phải >= 1")
+        if migrants < 0:
+            raise ValueError("migrants phải >= 0")
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.seed = seed
+
+    def solve(self, generations: int = 500) -> Tuple[List[int], int, int]:
+        import multiprocessing, queue
+        stop = multiprocessing.Event()
+        results = multiprocessing.Queue()
+        inboxes = [multiprocessing.Queue() for _ in range(self.islands)]
+
+        processes = []
+        for index in range(self.islands):
+            process = multiprocessing.Process(
+                target=_run_island,
+                args=(index, self.n, self.population_size, generations,
+                      self.migration_interval, self.migrants, self.seed,
+                      inboxes[index], inboxes[(index + 1) % self.islands], stop, results),
+                daemon=True,
+            )
+            process.start()
+            processes.append(process)
+
+        # Đọc kết quả trước khi join để tiến trình con không bị kẹt khi ghi vào queue
+        island_results = {}
+        try:
+            while len(island_results) < len(processes):
+                try:
+                    result = results.get(timeout=0.1)
+                except queue.Empty:
+                    dead = [index for index, process in enumerate(processes)
+                            if process.exitcode is not None and index not in island_results]
+                    if not dead:
+                        continue
+                    # Đảo thoát bình thường đã ghi xong kết quả trước khi thoát,
+                    # nên nếu queue vẫn rỗng thì đảo đó đã chết vì lỗi
+                    try:
+                        result = results.get(timeout=0.1)
+                    except queue.Empty:
+                        raise RuntimeError(f"Đảo {dead[0]} dừng (exitcode {processes[dead[0]].exitcode}) "
+                                           f"mà không gửi kết quả") from None
+                island_results[result[0]] = result
+        finally:
+            stop.set()
+            for process in processes:
+                if len(island_results) < len(processes) and process.is_alive():
+                    process.terminate()
+                process.join()
+
+        _, best_individual, best_conflicts, generation = min(island_results.values(), key=lambda r: (r[2], r[3]))
+        return best_individual, best_conflicts, generation
+
+class IncrementalRepair(NQueensOptimization):
+    """
+    Sửa lại một nghiệm có sẵn sau khi bị xáo trộn (di chuyển vài quân hậu
+    hoặc tăng kích thước bàn cờ) thay vì giải lại từ đầu.
+    Chỉ các cột đang bị tấn công mới được xét lại (min-conflicts cục bộ).
+    """
+
+    def repair(self, state: List[int], changes: Dict[int, int] = None,
+               pin_changes: bool = True, max_steps: int = 10000,
+               noise: float = 0.1) -> Tuple[List[int], int, int]:
+        """
+        - `state`: nghiệm cũ, có thể ngắn hơn self.n (khi đi từ n lên n+1).
+        - `changes`: {cột: hàng} các quân hậu bị di chuyển bắt buộc.
+        - `pin_changes`: giữ cố định các quân hậu trong `changes`.
+        - `noise`: xác suất đi ngẫu nhiên khi bị kẹt ở cực tiểu cục bộ.
+        """
+        changes = changes or {}
+        if (len(state) > self.n or any(not 0 <= row < self.n for row in state)
+                or any(not (0 <= col < self.n and 0 <= row < self.n) for col, row in changes.items())):
+            raise ValueError(f"Trạng thái/thay đổi vượt quá bàn cờ {self.n}x{self.n}")
+
+        n = self.n
+        old_n = len(state)
+        rows = list(state) + [0] * (n - old_n) # cột mới tạm đặt ở hàng 0
+        for col, row in changes.items():
+            rows[col] = row
+        # Bộ đếm hàng/đường chéo của BoardState được cập nhật O(1) sau mỗi bước
+        current = BoardState(rows)
+
+        def best_row(col):
+            scores = [current.attacks(col, row) for row in range(n)]
+            best = min(scores)
+            if best >= scores[current[col]] and random.random() < noise:
+                # Không cải thiện được: thỉnh thoảng đi ngẫu nhiên để thoát cực tiểu cục bộ
+                return random.randrange(n)
+            ties = [row for row in range(n) if scores[row] == best]
+            # Ưu tiên hàng còn trống để nghiệm tiến dần về một hoán vị
+            empty = [row for row in ties if current.row_counts[row] == 0]
+            return random.choice(empty or ties)
+
+        # Bàn cờ lớn hơn: đặt các cột mới vào hàng ít bị tấn công nhất
+        for col in range(old_n, n):
+            if col not in changes:
+                current.move(col, best_row(col))
+
+        pinned = set(changes) if pin_changes else set()
+        steps = 0
+        while steps < max_steps:
+            # Chỉ xét lại các cột đang bị tấn công (quét O(n) bằng bộ đếm)
+            conflicted = [col for col in current.attacked_columns() if col not in pinned]
+            if not conflicted:
+                break
+
+            col = random.choice(conflicted)
+            current.move(col, best_row(col))
+            steps += 1
+
+        return current.tolist(), self.conflicts(current), steps
+
+class PermutationSearch(NQueensOptimization):
+    """
+    Base class cho các thuật toán giữ trạng thái là một hoán vị:
+    mỗi hàng có đúng một quân hậu nên chỉ còn xung đột trên đường chéo.
+    Không gian tìm kiếm giảm từ n^n xuống n!.
+    """
+
+    def random_permutation(self) -> List[int]:
+        return random.sample(range(self.n), self.n)
+
+    def diagonal_counts(self, state: List[int]) -> Tuple[List[int], List[int]]:
+        """Đếm số quân hậu trên mỗi đường chéo (không cần đếm hàng)"""
+        diag1 = [0] * (2 * self.n - 1)
+        diag2 = [0] * (2 * self.n - 1)
+        for col in range(self.n):
+            row = state[col]
+            diag1[row - col + self.n - 1] += 1
+            diag2[row + col] += 1
+        return diag1, diag2
+
+    def diagonal_conflicts(self, state: List[int]) -> int:
+        """Số cặp tấn công nhau của một hoán vị (chỉ tính đường chéo)"""
+        return sum(count * (count - 1) // 2
+                   for counts in self.diagonal_counts(state) for count in counts)
+
+    def permutation_value(self, state: List[int]) -> int:
+        """Value function cho hoán vị: rẻ bằng một nửa value_function"""
+        return self.n * (self.n - 1) // 2 - self.diagonal_conflicts(state)
+
+class HillClimbingPermutation(PermutationSearch):
+    """Hill Climbing trên hoán vị với lân cận hoán đổi (swap)"""
+
+    def solve(self, max_iterations: int = 1000) -> Tuple[List[int], int, int]:
+        current = BoardState(self.random_permutation())
+
+        for iteration in range(max_iterations):
+            if current.conflicts == 0:
+                return current.tolist(), current.conflicts, iteration
+
+            # Thử mọi swap có ít nhất một quân hậu đang bị tấn công, giữ swap tốt nhất
+            best_delta, best_moves = 0, []
+            for i in current.attacked_columns():
+                for j in range(self.n):
+                    if j == i:
+                        continue
+                    delta = current.swap(i, j)
+                    current.undo()
+                    if delta < best_delta:
+                        best_delta, best_moves = delta, [(i, j)]
+                    elif delta == best_delta and best_delta < 0:
+                        best_moves.append((i, j))
+
+            if not best_moves:
+                break  # Local maximum
+
+            current.swap(*random.choice(best_moves))
+
+        return current.tolist(), current.conflicts, iteration
+
+class SimulatedAnnealingPermutation(PermutationSearch):
+    """Simulated Annealing trên hoán vị với lân cận hoán đổi (swap)"""
+
+    def solve(self, initial_temp: float = 100, cooling_rate: float = 0.95,
+              min_temp: float = 0.01) -> Tuple[List[int], int, int]:
+        current = BoardState(self.random_permutation())
+
+        temperature = initial_temp
+        iteration = 0
+
+        while temperature > min_temp:
+            if current.conflicts == 0:
+                return current.tolist(), current.conflicts, iteration
+
+            # Swap một quân hậu đang bị tấn công với một cột ngẫu nhiên
+            i = random.choice(current.attacked_columns())
+            j = random.randrange(self.n - 1)
+            j += j >= i
+            delta = current.swap(i, j)
+
+            # Acceptance probability (value = -conflicts)
+            if delta > 0 and random.random() >= math.exp(-delta / temperature):
+                current.undo()
+
+            temperature *= cooling_rate
+            iteration += 1
+
+        return current.tolist(), current.conflicts, iteration
+
+class GeneticAlgorithmPermutation(PermutationSearch):
+    """Genetic Algorithm trên hoán vị với PMX / Order crossover và swap mutation"""
+    def __init__(self, n: int = 5, population_size: int = 50, crossover_method: str = 'pmx'):
+        super().__init__(n)
+        self.population_size = population_size
+        self.crossover_method = crossover_method
+
+    def solve(self, generations: int = 500) -> Tuple[List[int], int, int]:
+        population = [self.random_permutation() for _ in range(self.population_size)]
+        max_fitness = self.n * (self.n - 1) // 2
+        crossover = self.pmx_crossover if self.crossover_method == 'pmx' else self.order_crossover
+
+        for generation in range(generations):
+            fitnesses = [self.permutation_value(individual) for individual in population]
+
+            best_fitness = max(fitnesses)
+            if best_fitness == max_fitness:
+                best_individual = population[fitnesses.index(best_fitness)]
+                return best_individual, 0, generation
+
+            new_population = []
+            for _ in range(self.population_size // 2):
+                parent1 = self.tournament_selection(population, fitnesses)
+                parent2 = self.tournament_selection(population, fitnesses)
+
+                child1, child2 = crossover(parent1, parent2), crossover(parent2, parent1)
+                new_population.extend([self.swap_mutation(child1), self.swap_mutation(child2)])
+
+            population = new_population[:self.population_size]
+
+        fitnesses = [self.permutation_value(individual) for individual in population]
+        best_individual = population[fitnesses.index(max(fitnesses))]
+        return best_individual, self.diagonal_conflicts(best_individual), generations
+
+    def tournament_selection(self, population: List[List[int]], fitnesses: List[float],
+                             tournament_size: int = 3) -> List[int]:
+        tournament_indices = random.sample(range(len(population)),
+                                           min(tournament_size, len(population)))
+        return population[max(tournament_indices, key=lambda i: fitnesses[i])]
+
+    def pmx_crossover(self, parent1: List[int], parent2: List[int]) -> List[int]:
+        """Partially Mapped Crossover: giữ đoạn giữa của parent1, phần còn lại theo parent2"""
+        start, end = sorted(random.sample(range(self.n + 1), 2))
+        child = [None] * self.n
+        child[start:end] = parent1[start:end]
+        position_in_parent1 = {row: col for col, row in enumerate(parent1)}
+
+        for col in list(range(start)) + list(range(end, self.n)):
+            row = parent2[col]
+            # Giá trị đã có trong đoạn giữa: đi theo ánh xạ parent1 -> parent2
+            while start <= position_in_parent1[row] < end:
+                row = parent2[position_in_parent1[row]]
+            child[col] = row
+        return child
+
+    def order_crossover(self, parent1: List[int], parent2: List[int]) -> List[int]:
+        """Order Crossover (OX): giữ đoạn giữa của parent1, điền theo thứ tự của parent2"""
+        start, end = sorted(random.sample(range(self.n + 1), 2))
+        segment = set(parent1[start:end])
+        rest = [row for row in parent2[end:] + parent2[:end] if row not in segment]
+        child = [None] * self.n
+        child[start:end] = parent1[start:end]
+        for offset, row in enumerate(rest):
+            child[(end + offset) % self.n] = row
+        return child
+
+    def swap_mutation(self, individual: List[int], mutation_rate: float = 0.1) -> List[int]:
+        """Đổi chỗ hai gen: kết quả vẫn là hoán vị"""
+        for i in range(self.n):
+            if random.random() < mutation_rate:
+                j = random.randrange(self.n)
+                individual[i], individual[j] = individual[j], individual[i]
+        return individual
 
 def convert_csp_solution(solution: Dict[str, int], n: int) -> List[int]:
     """Chuyển đổi solution từ CSP sang list"""
@@ -348,6 +901,8 @@ def convert_csp_solution(solution: Dict[str, int], n: int) -> List[int]:
     return [solution[f'Q{i}'] for i in range(n)]
 
 def main():
+    from simpleai.search import backtrack
+    from simpleai.search.csp import MOST_CONSTRAINED_VARIABLE, LEAST_CONSTRAINING_VALUE
     n = 5
     results = []
     
@@ -485,8 +1040,74 @@ def main():
         ga.print_board(ga_solution)
     
     results.append(("GA", ga_time, ga_conflicts == 0))
-    
-    # 5. So sánh kết quả tổng thể
+
+    # 5. Sửa nghiệm sau khi di chuyển một quân hậu / tăng kích thước bàn cờ
+    print(f"\n5. SỬA NGHIỆM (INCREMENTAL REPAIR)")
+    changes = {0: (best_hc_solution[0] + 1) % n}
+    print(f"  Nghiệm gốc: {best_hc_solution}, di chuyển: {changes}")
+
+    start_time = time.time()
+    repaired, repair_conflicts, repair_steps = IncrementalRepair(n).repair(best_hc_solution, changes)
+    repair_time = time.time() - start_time
+    print(f"  Thời gian: {repair_time:.4f}s, số bước: {repair_steps}")
+    print(f"  Nghiệm sau khi sửa: {repaired}, conflicts: {repair_conflicts}")
+
+    start_time = time.time()
+    grown, grown_conflicts, grown_steps = IncrementalRepair(n + 1).repair(best_hc_solution)
+    grown_time = time.time() - start_time
+    print(f"  Mở rộng lên {n + 1}x{n + 1}: {grown}, conflicts: {grown_conflicts} ({grown_time:.4f}s)")
+
+    results.append(("Incremental Repair", repair_time, repair_conflicts == 0))
+
+    # 6. HC / SA / GA trên hoán vị (lân cận swap)
+    print(f"\n6. HOÁN VỊ + SWAP")
+    permutation_solvers = [
+        ("HC (Permutation)", lambda: HillClimbingPermutation(n).solve()),
+        ("SA (Permutation)", lambda: SimulatedAnnealingPermutation(n).solve()),
+        ("GA (Permutation, PMX)", lambda: GeneticAlgorithmPermutation(n, population_size=40).solve(generations=300)),
+    ]
+    for name, run in permutation_solvers:
+        start_time = time.time()
+        perm_solution, perm_conflicts, perm_iterations = run()
+        perm_time = time.time() - start_time
+        print(f"  {name}: {perm_solution}, conflicts: {perm_conflicts}, "
+              f"số vòng lặp: {perm_iterations}, thời gian: {perm_time:.4f}s")
+        results.append((name, perm_time, perm_conflicts == 0))
+
+    # 7. Tabu Search
+    print(f"\n7. TABU SEARCH")
+    tabu = TabuSearch(n)
+
+    start_time = time.time()
+    tabu_solution, tabu_conflicts, tabu_iterations = tabu.solve()
+    tabu_time = time.time() - start_time
+
+    print(f"  Thời gian: {tabu_time:.4f}s")
+    print(f"  Số vòng lặp: {tabu_iterations}")
+    print(f"  Nghiệm: {tabu_solution}")
+    print(f"  Conflicts: {tabu_conflicts}")
+    if tabu_conflicts == 0:
+        tabu.print_board(tabu_solution)
+
+    results.append(("Tabu Search", tabu_time, tabu_conflicts == 0))
+
+    # 8. Island model GA (đa tiến trình, có di cư)
+    print(f"\n8. ISLAND MODEL GA")
+    island_ga = IslandGeneticAlgorithm(n, population_size=40)
+
+    start_time = time.time()
+    island_solution, island_conflicts, island_generations = island_ga.solve(generations=300)
+    island_time = time.time() - start_time
+
+    print(f"  Số đảo: {island_ga.islands}")
+    print(f"  Thời gian: {island_time:.4f}s")
+    print(f"  Số thế hệ: {island_generations}")
+    print(f"  Nghiệm: {island_solution}")
+    print(f"  Conflicts: {island_conflicts}")
+
+    results.append(("GA (Island model)", island_time, island_conflicts == 0))
+
+    # 9. So sánh kết quả tổng thể
     print(f"\n=== SO SÁNH HIỆU QUẢ CÁC THUẬT TOÁN ===")
     print(f"{'Thuật toán':<30} {'Thời gian (s)':<12} {'Thành công'}")
     print("-" * 55)
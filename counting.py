@@ -0,0 +1,237 @@
+import functools, time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# ================== Phần 1: Đếm nghiệm bằng bitmask ==================
+# Cùng mô hình với các bài trước: mỗi hàng là một biến, giá trị là cột đặt quân hậu.
+# Trạng thái sau khi đặt xong một số hàng gồm 3 bitmask (bit c = cột c):
+#   cols: các cột đã có quân hậu
+#   ld:   các ô của hàng kế tiếp bị đường chéo "\" tấn công (dịch trái mỗi hàng)
+#   rd:   các ô của hàng kế tiếp bị đường chéo "/" tấn công (dịch phải mỗi hàng)
+
+def count_completions(n: int, cols: int, ld: int, rd: int) -> int:
+    """Đếm số cách đặt nốt các hàng còn lại từ trạng thái (cols, ld, rd)"""
+    full = (1 << n) - 1
+    if cols == full:
+        return 1
+    total = 0
+    available = full & ~(cols | ld | rd)
+    while available:
+        bit = available & -available
+        available ^= bit
+        total += count_completions(n, cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1)
+    return total
+
+def count_solutions(n: int, geometry=None) -> int:
+    '''
+    Đếm tổng số nghiệm của bài toán N-Queens (quay lui bitmask thuần).
+    `geometry`: geometry.BoardGeometry (ô bị chặn, bàn xuyến, k hậu mỗi hàng); bàn thường vẫn dùng
+    count_completions, các biến thể dùng hàm đếm chuyên biệt của hình học đó.
+    '''
+    if geometry is not None and not geometry.is_standard:
+        from geometry import count_solutions as count_geometry
+        return count_geometry(geometry)
+    return count_completions(n, 0, 0, 0)
+
+# ================== Phần 2: Cache LRU có giới hạn ==================
+class LRUCache:
+    """Bảng băm có giới hạn, loại bỏ phần tử lâu không dùng nhất khi đầy"""
+    def __init__(self, maxsize: int = 100000):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self.data),
+        }
+
+@functools.lru_cache(maxsize=None)
+def _cache_manager_class():
+    """
+    Tạo lớp CacheManager khi cần lần đầu: multiprocessing.managers chiếm phần lớn thời gian
+    import module này, còn đếm tuần tự (batch.py, count_solutions) không cần đến nó
+    """
+    from multiprocessing.managers import BaseManager
+
+    class CacheManager(BaseManager):
+        """Manager chạy một LRUCache trong tiến trình riêng để các worker dùng chung"""
+
+    # Tên đầy đủ như lớp khai báo ở cấp module để pickle (start method spawn) tìm lại được
+    CacheManager.__qualname__ = 'CacheManager'
+    CacheManager.register('LRUCache', LRUCache)
+    return CacheManager
+
+def __getattr__(name):
+    if name == 'CacheManager':
+        return _cache_manager_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# ================== Phần 3: Đếm có ghi nhớ ở độ sâu tách ==================
+class MemoizedCounter:
+    '''
+    Đếm nghiệm có ghi nhớ: tới hàng `split_depth`, trạng thái (cols, ld, rd) được chuẩn hoá
+    rồi tra cache; nhiều tiền tố khác nhau dẫn đến cùng trạng thái còn lại chỉ cần đếm một lần.
+    Chuẩn hoá:
+      - Chỉ giữ các bit đường chéo còn có thể chạm tới một cột trống trong các hàng còn lại.
+      - Lấy đối xứng gương (cột c <-> n-1-c, đổi vai trò ld và rd), chọn khoá nhỏ hơn.
+    `shared_cache`: proxy LRUCache từ CacheManager để dùng chung giữa các tiến trình;
+    khi đó cache cục bộ vẫn đứng trước để giảm số lần gọi qua tiến trình khác.
+    '''
+    def __init__(self, n: int, split_depth: Optional[int] = None, maxsize: int = 100000,
+                 shared_cache=None):
+        self.n = n
+        self.full = (1 << n) - 1
+        # Tách nông (~n/4): ít nút cần chuẩn hoá khoá, mỗi lần trúng cache tiết kiệm một cây con lớn
+        self.split_depth = n // 4 if split_depth is None else split_depth
+        self.cache = LRUCache(maxsize)
+        self.shared_cache = shared_cache
+        self.shared_hits = 0
+
+    def reverse(self, mask: int) -> int:
+        """Đảo thứ tự n bit (đối xứng gương)"""
+        return int(format(mask, f'0{self.n}b')[::-1], 2)
+
+    def canonical_key(self, cols: int, ld: int, rd: int) -> Tuple[int, int, int]:
+        remaining = self.n - bin(cols).count('1')
+        window = (1 << remaining) - 1
+        free = self.full & ~cols
+        ld_relevant = rd_relevant = 0
+        while free:
+            bit = free & -free
+            free ^= bit
+            # Bit ld ở cột p chạm cột p + t sau t hàng, bit rd chạm cột p - t (0 <= t < remaining)
+            ld_relevant |= (bit * window) >> (remaining - 1)
+            rd_relevant |= bit * window
+        key = (cols, ld & ld_relevant, rd & rd_relevant & self.full)
+        mirror = (self.reverse(key[0]), self.reverse(key[2]), self.reverse(key[1]))
+        return min(key, mirror)
+
+    def count_from(self, cols: int, ld: int, rd: int, depth: int) -> int:
+        if depth == self.split_depth:
+            key = self.canonical_key(cols, ld, rd)
+            total = self.cache.get(key)
+            if total is None and self.shared_cache is not None:
+                total = self.shared_cache.get(key)
+                if total is not None:
+                    self.shared_hits += 1
+                    self.cache.put(key, total)
+            if total is None:
+                total = count_completions(self.n, cols, ld, rd)
+                self.cache.put(key, total)
+                if self.shared_cache is not None:
+                    self.shared_cache.put(key, total)
+            return total
+
+        if cols == self.full:
+            return 1
+        total = 0
+        available = self.full & ~(cols | ld | rd)
+        while available:
+            bit = available & -available
+            available ^= bit
+            total += self.count_from(cols | bit, ((ld | bit) << 1) & self.full, (rd | bit) >> 1, depth + 1)
+        return total
+
+    def count(self) -> int:
+        return self.count_from(0, 0, 0, 0)
+
+    def count_first_row(self, col: int) -> int:
+        """Số nghiệm có quân hậu hàng 0 ở cột `col` (đơn vị công việc cho các worker)"""
+        bit = 1 << col
+        return self.count_from(bit, (bit << 1) & self.full, bit >> 1, 1)
+
+    def stats(self) -> Dict[str, float]:
+        stats = self.cache.stats()
+        stats['shared_hits'] = self.shared_hits
+        # Lần trượt cache cục bộ nhưng trúng cache chung vẫn tính là trúng
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + self.shared_hits) / lookups if lookups else 0.0
+        return stats
+
+# ================== Phần 4: Đếm song song ==================
+def _count_first_rows(n, columns, split_depth, maxsize, shared_cache):
+    counter = MemoizedCounter(n, split_depth, maxsize, shared_cache)
+    total = sum(counter.count_first_row(col) for col in columns)
+    return total, counter.stats()
+
+def count_parallel(n: int, workers: Optional[int] = None, split_depth: Optional[int] = None,
+                   maxsize: int = 100000, share_cache: bool = True) -> Tuple[int, Dict[str, float]]:
+    '''
+    Chia công việc theo cột của hàng đầu cho một process pool.
+    Nhờ đối xứng gương chỉ cần đếm nửa trái của hàng đầu rồi nhân đôi (cộng cột giữa nếu n lẻ).
+    Trả về (số nghiệm, thống kê cache gộp của các worker).
+    '''
+    from concurrent.futures import ProcessPoolExecutor # chỉ cần khi đếm song song
+
+    half = n // 2
+    jobs = [([col], 2) for col in range(half)]
+    if n % 2:
+        jobs.append(([half], 1))
+
+    manager = None
+    shared_cache = None
+    if share_cache:
+        manager = _cache_manager_class()()
+        manager.start()
+        shared_cache = manager.LRUCache(maxsize)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [(weight, pool.submit(_count_first_rows, n, columns, split_depth, maxsize, shared_cache))
+                       for columns, weight in jobs]
+            total = 0
+            stats = {'hits': 0, 'misses': 0, 'shared_hits': 0}
+            for weight, future in futures:
+                count, worker_stats = future.result()
+                total += weight * count
+                for name in stats:
+                    stats[name] += worker_stats[name]
+    finally:
+        if manager is not None:
+            manager.shutdown()
+
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = (stats['hits'] + stats['shared_hits']) / lookups if lookups else 0.0
+    return total, stats
+
+# ================== Phần 5: Khối thực thi chính ==================
+if __name__ == "__main__":
+    print(f"{'N':>3} | {'Số nghiệm':>10} | {'Thuần (s)':>10} | {'Ghi nhớ (s)':>11} | {'Hit rate':>8} | {'Song song (s)':>13}")
+    print("-" * 72)
+    for N in range(8, 13):
+        start_time = time.time()
+        plain = count_solutions(N)
+        plain_time = time.time() - start_time
+
+        start_time = time.time()
+        counter = MemoizedCounter(N)
+        memoized = counter.count()
+        memoized_time = time.time() - start_time
+
+        start_time = time.time()
+        parallel, parallel_stats = count_parallel(N)
+        parallel_time = time.time() - start_time
+
+        assert plain == memoized == parallel
+        print(f"{N:>3} | {plain:>10} | {plain_time:>10.4f} | {memoized_time:>11.4f} | "
+              f"{counter.stats()['hit_rate']:>8.1%} | {parallel_time:>13.4f}")
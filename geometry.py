@@ -0,0 +1,336 @@
+import itertools, random, time
+from array import array
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+# ================== Phần 1: Mô tả hình học bàn cờ ==================
+class BoardGeometry:
+    '''
+    Hình học của bàn cờ cho các engine nhanh (đếm bitmask, quay lui bitmask, min-conflicts):
+    - `n` hàng, `cols` cột (mặc định n).
+    - `blocked`: các ô (hàng, cột) không được đặt quân hậu; quân hậu vẫn tấn công xuyên qua ô bị chặn.
+    - `toroidal`: bàn cờ xuyến, đường chéo quấn vòng theo modulo (chỉ cho bàn vuông).
+    - `queens_per_row`: mỗi hàng đặt đúng k quân hậu; các quân cùng hàng không tính là tấn công nhau,
+      cột và đường chéo vẫn chỉ được có một quân (nên cần cols >= n * k).
+    Mọi mặt nạ được tính sẵn một lần cho mỗi hình học, vòng lặp nóng chỉ đọc lại chúng.
+    '''
+    def __init__(self, n: int, cols: int = None, blocked=(), toroidal: bool = False,
+                 queens_per_row: int = 1):
+        self.n = n
+        self.cols = n if cols is None else cols
+        self.blocked = frozenset((row, col) for row, col in blocked)
+        self.toroidal = toroidal
+        self.queens_per_row = queens_per_row
+        if queens_per_row < 1:
+            raise ValueError("queens_per_row phải >= 1")
+        if toroidal and self.cols != n:
+            raise ValueError("Bàn cờ xuyến phải là bàn vuông")
+        if any(not (0 <= row < n and 0 <= col < self.cols) for row, col in self.blocked):
+            raise ValueError(f"Ô bị chặn nằm ngoài bàn cờ {n}x{self.cols}")
+
+        # Mặt nạ các ô còn đặt được của từng hàng (bit c = cột c)
+        self.full = (1 << self.cols) - 1
+        row_masks = [self.full] * n
+        for row, col in self.blocked:
+            row_masks[row] &= ~(1 << col)
+        self.row_masks = tuple(row_masks)
+
+        # Chỉ số đường chéo của từng ô (ô (r, c) ở vị trí r * cols + c) cho min-conflicts
+        if toroidal:
+            self.diagonals = n
+            self.diag1 = array('I', [(row - col) % n for row in range(n) for col in range(n)])
+            self.diag2 = array('I', [(row + col) % n for row in range(n) for col in range(n)])
+        else:
+            self.diagonals = n + self.cols - 1
+            self.diag1 = array('I', [row - col + self.cols - 1 for row in range(n) for col in range(self.cols)])
+            self.diag2 = array('I', [row + col for row in range(n) for col in range(self.cols)])
+
+    @classmethod
+    def from_diagram(cls, rows: Sequence[str], **kwargs) -> 'BoardGeometry':
+        """Tạo từ sơ đồ, mỗi chuỗi là một hàng: '#' là ô bị chặn, ký tự khác là ô trống"""
+        blocked = [(row, col) for row, line in enumerate(rows) for col, cell in enumerate(line) if cell == '#']
+        return cls(len(rows), len(rows[0]) if rows else 0, blocked, **kwargs)
+
+    @classmethod
+    def from_params(cls, n: int, params: Dict[str, Any]) -> 'BoardGeometry':
+        """Lấy (và xoá) các khoá hình học khỏi `params` của batch.py: cols, blocked, toroidal, queens_per_row"""
+        return cls(n, params.pop('cols', None), [tuple(cell) for cell in params.pop('blocked', ())],
+                   params.pop('toroidal', False), params.pop('queens_per_row', 1))
+
+    @property
+    def is_standard(self) -> bool:
+        """Bàn cờ n x n thường: các engine dùng lại hàm chuyên biệt sẵn có"""
+        return not self.blocked and not self.toroidal and self.queens_per_row == 1 and self.cols == self.n
+
+    def attacks(self, a: Tuple[int, int], b: Tuple[int, int]) -> bool:
+        """Hai quân hậu ở ô a, b có tấn công nhau không"""
+        (row1, col1), (row2, col2) = a, b
+        if col1 == col2:
+            return True
+        if row1 == row2:
+            return self.queens_per_row == 1
+        d_row, d_col = row2 - row1, col2 - col1
+        if self.toroidal:
+            return (d_row - d_col) % self.n == 0 or (d_row + d_col) % self.n == 0
+        return abs(d_row) == abs(d_col)
+
+    def is_solution(self, placement: Sequence) -> bool:
+        """Kiểm tra nghiệm (chậm, O(số quân hậu ^ 2)); placement[hàng] là cột hoặc danh sách cột"""
+        queens = []
+        for row, cols in enumerate(placement):
+            cols = [cols] if isinstance(cols, int) else list(cols)
+            if len(cols) != self.queens_per_row or len(set(cols)) != len(cols):
+                return False
+            queens.extend((row, col) for col in cols)
+        if len(placement) != self.n or any(queen in self.blocked for queen in queens):
+            return False
+        return not any(self.attacks(a, b) for a, b in itertools.combinations(queens, 2))
+
+    def to_placement(self, masks: Sequence[int]) -> List:
+        """Chuyển mặt nạ từng hàng thành cột (k = 1) hoặc danh sách cột (k > 1)"""
+        placement = [[col for col in range(self.cols) if mask >> col & 1] for mask in masks]
+        return [cols[0] for cols in placement] if self.queens_per_row == 1 else placement
+
+# ================== Phần 2: Quay lui bitmask chuyên biệt theo hình học ==================
+# Cùng mô hình với counting.py: (cols, ld, rd) là các cột / ô của hàng kế tiếp bị tấn công.
+# Mỗi hình học có một hàm riêng (đóng gói các mặt nạ tính sẵn), để vòng lặp nóng không phải
+# rẽ nhánh theo loại bàn cờ ở từng nút.
+
+def bit_subsets(mask: int, k: int) -> Iterator[int]:
+    """Mọi tập con k bit của `mask`"""
+    bits = []
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        bits.append(bit)
+    for combination in itertools.combinations(bits, k):
+        yield sum(combination)
+
+def make_counter(geometry: BoardGeometry):
+    """Trả về count(row, cols, ld, rd): số cách đặt nốt các hàng từ `row` đến hết"""
+    n, full, masks, k = geometry.n, geometry.full, geometry.row_masks, geometry.queens_per_row
+    high = geometry.cols - 1
+
+    if k == 1 and not geometry.toroidal:
+        def count(row, cols, ld, rd):
+            if row == n:
+                return 1
+            total = 0
+            available = masks[row] & ~(cols | ld | rd)
+            while available:
+                bit = available & -available
+                available ^= bit
+                total += count(row + 1, cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1)
+            return total
+    elif k == 1:
+        # Bàn xuyến: đường chéo quay vòng thay vì bị đẩy ra khỏi bàn
+        def count(row, cols, ld, rd):
+            if row == n:
+                return 1
+            total = 0
+            available = masks[row] & ~(cols | ld | rd)
+            while available:
+                bit = available & -available
+                available ^= bit
+                next_ld, next_rd = ld | bit, rd | bit
+                total += count(row + 1, cols | bit, ((next_ld << 1) | (next_ld >> high)) & full,
+                               (next_rd >> 1) | ((next_rd & 1) << high))
+            return total
+    elif not geometry.toroidal:
+        def count(row, cols, ld, rd):
+            if row == n:
+                return 1
+            total = 0
+            for chosen in bit_subsets(masks[row] & ~(cols | ld | rd), k):
+                total += count(row + 1, cols | chosen, ((ld | chosen) << 1) & full, (rd | chosen) >> 1)
+            return total
+    else:
+        def count(row, cols, ld, rd):
+            if row == n:
+                return 1
+            total = 0
+            for chosen in bit_subsets(masks[row] & ~(cols | ld | rd), k):
+                next_ld, next_rd = ld | chosen, rd | chosen
+                total += count(row + 1, cols | chosen, ((next_ld << 1) | (next_ld >> high)) & full,
+                               (next_rd >> 1) | ((next_rd & 1) << high))
+            return total
+    return count
+
+def count_solutions(geometry: BoardGeometry) -> int:
+    """Đếm số nghiệm trên một hình học bất kỳ"""
+    return make_counter(geometry)(0, 0, 0, 0)
+
+def make_enumerator(geometry: BoardGeometry):
+    '''
+    Trả về place(row, cols, ld, rd): generator sinh mặt nạ của các hàng `row`.. cho mọi nghiệm
+    (danh sách `placement` dùng chung, người gọi phải sao chép nếu giữ lại).
+    Chuyên biệt theo loại hình học giống make_counter.
+    '''
+    n, full, masks, k = geometry.n, geometry.full, geometry.row_masks, geometry.queens_per_row
+    high = geometry.cols - 1
+    placement = [0] * n
+
+    if k == 1 and not geometry.toroidal:
+        def place(row, cols, ld, rd):
+            if row == n:
+                yield placement
+                return
+            available = masks[row] & ~(cols | ld | rd)
+            while available:
+                bit = available & -available
+                available ^= bit
+                placement[row] = bit
+                yield from place(row + 1, cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1)
+    elif k == 1:
+        def place(row, cols, ld, rd):
+            if row == n:
+                yield placement
+                return
+            available = masks[row] & ~(cols | ld | rd)
+            while available:
+                bit = available & -available
+                available ^= bit
+                placement[row] = bit
+                next_ld, next_rd = ld | bit, rd | bit
+                yield from place(row + 1, cols | bit, ((next_ld << 1) | (next_ld >> high)) & full,
+                                 (next_rd >> 1) | ((next_rd & 1) << high))
+    elif not geometry.toroidal:
+        def place(row, cols, ld, rd):
+            if row == n:
+                yield placement
+                return
+            for chosen in bit_subsets(masks[row] & ~(cols | ld | rd), k):
+                placement[row] = chosen
+                yield from place(row + 1, cols | chosen, ((ld | chosen) << 1) & full, (rd | chosen) >> 1)
+    else:
+        def place(row, cols, ld, rd):
+            if row == n:
+                yield placement
+                return
+            for chosen in bit_subsets(masks[row] & ~(cols | ld | rd), k):
+                placement[row] = chosen
+                next_ld, next_rd = ld | chosen, rd | chosen
+                yield from place(row + 1, cols | chosen, ((next_ld << 1) | (next_ld >> high)) & full,
+                                 (next_rd >> 1) | ((next_rd & 1) << high))
+    return place
+
+def iter_solutions(geometry: BoardGeometry) -> Iterator[List]:
+    """Liệt kê các nghiệm (dạng của BoardGeometry.to_placement) bằng quay lui bitmask"""
+    for masks in make_enumerator(geometry)(0, 0, 0, 0):
+        yield geometry.to_placement(masks)
+
+def first_solution(geometry: BoardGeometry):
+    """Nghiệm đầu tiên theo thứ tự quay lui, hoặc None nếu không có nghiệm"""
+    return next(iter_solutions(geometry), None)
+
+# ================== Phần 3: Min-conflicts theo hình học ==================
+class MinConflicts:
+    '''
+    Min-conflicts trên một BoardGeometry: mỗi hàng giữ đúng k quân hậu ở các ô không bị chặn,
+    mỗi bước chuyển một quân hậu đang bị tấn công sang ô ít bị tấn công nhất trong hàng của nó.
+    Bộ đếm cột / đường chéo (theo chỉ số đường chéo tính sẵn của hình học) được cập nhật O(1) mỗi bước.
+    '''
+    def __init__(self, geometry: BoardGeometry):
+        self.geometry = geometry
+        # Các cột đặt được của từng hàng
+        self.allowed = [[col for col in range(geometry.cols) if mask >> col & 1] for mask in geometry.row_masks]
+        if any(len(cols) < geometry.queens_per_row for cols in self.allowed):
+            raise ValueError("Có hàng không đủ ô trống cho queens_per_row quân hậu")
+
+    def solve(self, max_steps: int = 10000, noise: float = 0.1) -> Tuple[List, int, int]:
+        """Trả về (nghiệm dạng to_placement, số cặp tấn công nhau, số bước)"""
+        geometry = self.geometry
+        width, diag1, diag2 = geometry.cols, geometry.diag1, geometry.diag2
+        col_counts = array('I', bytes(4 * width))
+        diag1_counts = array('I', bytes(4 * geometry.diagonals))
+        diag2_counts = array('I', bytes(4 * geometry.diagonals))
+        queens = [] # [hàng, cột] của từng quân hậu
+        occupied = [set() for _ in range(geometry.n)]
+        conflicts = 0
+
+        def attacks(row, col):
+            cell = row * width + col
+            return col_counts[col] + diag1_counts[diag1[cell]] + diag2_counts[diag2[cell]]
+
+        def add(row, col):
+            nonlocal conflicts
+            cell = row * width + col
+            conflicts += attacks(row, col)
+            col_counts[col] += 1
+            diag1_counts[diag1[cell]] += 1
+            diag2_counts[diag2[cell]] += 1
+            occupied[row].add(col)
+
+        def remove(row, col):
+            nonlocal conflicts
+            cell = row * width + col
+            col_counts[col] -= 1
+            diag1_counts[diag1[cell]] -= 1
+            diag2_counts[diag2[cell]] -= 1
+            occupied[row].discard(col)
+            conflicts -= attacks(row, col)
+
+        def best_col(row, current=None):
+            candidates = [col for col in self.allowed[row] if col not in occupied[row]]
+            scores = [attacks(row, col) for col in candidates]
+            best = min(scores)
+            if current is not None and best >= attacks(row, current) and random.random() < noise:
+                # Không cải thiện được: thỉnh thoảng đi ngẫu nhiên để thoát cực tiểu cục bộ
+                return random.choice(candidates)
+            return random.choice([col for col, score in zip(candidates, scores) if score == best])
+
+        # Khởi tạo tham lam: đặt lần lượt từng quân vào ô ít bị tấn công nhất
+        for row in random.sample(range(geometry.n), geometry.n):
+            for _ in range(geometry.queens_per_row):
+                col = best_col(row)
+                add(row, col)
+                queens.append([row, col])
+
+        steps = 0
+        while conflicts and steps < max_steps:
+            # Chỉ xét các quân hậu đang bị tấn công (quét O(số quân hậu) bằng bộ đếm)
+            conflicted = [queen for queen in queens
+                          if col_counts[queen[1]] > 1
+                          or diag1_counts[diag1[queen[0] * width + queen[1]]] > 1
+                          or diag2_counts[diag2[queen[0] * width + queen[1]]] > 1]
+            queen = random.choice(conflicted)
+            row, col = queen
+            remove(row, col)
+            queen[1] = best_col(row, col)
+            add(row, queen[1])
+            steps += 1
+
+        masks = [0] * geometry.n
+        for row, col in queens:
+            masks[row] |= 1 << col
+        return geometry.to_placement(masks), conflicts, steps
+
+# ================== Phần 4: Khối thực thi chính ==================
+if __name__ == "__main__":
+    from counting import count_completions
+
+    N = 10
+    variants = [
+        ("Bàn thường", BoardGeometry(N)),
+        ("Ô bị chặn (đường chéo chính)", BoardGeometry(N, blocked=[(i, i) for i in range(N)])),
+        ("Bàn xuyến 11x11", BoardGeometry(11, toroidal=True)),
+        ("2 hậu mỗi hàng, 5x10", BoardGeometry(5, 10, queens_per_row=2)),
+    ]
+
+    start_time = time.time()
+    baseline = count_completions(N, 0, 0, 0)
+    print(f"counting.count_completions ({N}x{N}): {baseline} nghiệm, {time.time() - start_time:.4f}s\n")
+
+    print(f"{'Hình học':<30} | {'Số nghiệm':>9} | {'Đếm (s)':>8} | {'Min-conflicts':>13} | {'Bước':>5}")
+    print("-" * 80)
+    for name, geometry in variants:
+        start_time = time.time()
+        total = count_solutions(geometry)
+        count_time = time.time() - start_time
+
+        first = first_solution(geometry)
+        assert first is None or geometry.is_solution(first)
+        random.seed(0)
+        placement, conflicts, steps = MinConflicts(geometry).solve()
+        assert conflicts or geometry.is_solution(placement)
+        status = "giải được" if conflicts == 0 else f"{conflicts} xung đột"
+        print(f"{name:<30} | {total:>9} | {count_time:>8.4f} | {status:>13} | {steps:>5}")
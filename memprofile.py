@@ -0,0 +1,175 @@
+import argparse, math, os, sys, threading, tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+# ================== Phần 1: Đo bộ nhớ của một lần chạy ==================
+# Bỏ qua cấp phát của chính tracemalloc / luồng lấy mẫu khi thống kê vị trí cấp phát
+IGNORED_FILES = (tracemalloc.__file__, threading.__file__, __file__)
+
+class PeakSampler(threading.Thread):
+    '''
+    Luồng nền lấy mẫu bộ nhớ đang dùng mỗi `interval` giây; mỗi khi bộ nhớ vượt ngưỡng
+    thì chụp snapshot rồi nâng ngưỡng lên `growth` lần. Nhờ vậy snapshot cuối cùng nằm gần
+    đỉnh bộ nhớ (chứ không phải lúc solver đã trả kết quả và giải phóng gần hết),
+    mà số lần chụp chỉ tăng theo log của đỉnh bộ nhớ.
+    `base`: bộ nhớ nền (của bên gọi) không tính vào ngưỡng tăng.
+    '''
+    def __init__(self, interval: float = 0.001, growth: float = 1.1, base: int = 0):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.growth = growth
+        self.base = base
+        self.threshold = base
+        self.snapshot = None
+        self.snapshot_size = 0
+        self.stopped = threading.Event()
+
+    def capture(self):
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self.threshold:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.snapshot_size = current
+            self.threshold = self.base + (current - self.base) * self.growth
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.capture()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+def top_sites(snapshot, top: int = 5, baseline=None) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    (tổng số khối nhớ, `top` dòng code giữ nhiều bộ nhớ nhất) của một snapshot;
+    có `baseline` thì chỉ tính phần tăng thêm so với snapshot đó
+    """
+    ignored = [tracemalloc.Filter(False, path) for path in IGNORED_FILES]
+    snapshot = snapshot.filter_traces(ignored)
+    if baseline is None:
+        statistics = [(stat.traceback, stat.size, stat.count) for stat in snapshot.statistics('lineno')]
+    else:
+        statistics = [(stat.traceback, stat.size_diff, stat.count_diff)
+                      for stat in snapshot.compare_to(baseline.filter_traces(ignored), 'lineno')
+                      if stat.size_diff > 0]
+        statistics.sort(key=lambda stat: stat[1], reverse=True)
+    sites = [{
+        'site': f"{os.path.basename(traceback[0].filename)}:{traceback[0].lineno}",
+        'size': size,
+        'count': count,
+    } for traceback, size, count in statistics[:top]]
+    return sum(max(count, 0) for _, _, count in statistics), sites
+
+def measure(func: Callable, *args, top: int = 5, interval: float = 0.001) -> Tuple[Any, Dict[str, Any]]:
+    '''
+    Chạy func(*args) dưới tracemalloc, trả về (kết quả, thống kê bộ nhớ):
+    - peak_memory: đỉnh bộ nhớ Python cấp phát trong lúc chạy (byte)
+    - allocations: số khối nhớ còn sống tại snapshot gần đỉnh nhất
+    - top_allocations: các dòng code giữ nhiều bộ nhớ nhất tại snapshot đó
+    - sampled_memory: bộ nhớ lúc chụp snapshot đó (càng gần peak_memory thì top_allocations càng sát đỉnh)
+    Module của solver nên được import trước khi đo để không tính cấp phát lúc import.
+    Nếu tracemalloc đã được bật từ trước thì không xoá traces/peak của bên gọi: mọi số liệu
+    được tính tương đối so với snapshot nền chụp ngay trước khi chạy.
+    Chạy dưới tracemalloc chậm hơn bình thường vài lần, không dùng để so sánh thời gian.
+    '''
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    # Luồng chính phải nhả GIL thường xuyên thì luồng lấy mẫu mới chạy được mỗi `interval` giây
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(min(switch_interval, interval))
+    base_current, base_peak = tracemalloc.get_traced_memory() if already_tracing else (0, 0)
+    sampler = PeakSampler(interval, base=base_current)
+    sampler.start()
+    if already_tracing:
+        # Giữ nguyên traces/peak của bên gọi, chỉ chụp snapshot nền để so sánh
+        baseline = tracemalloc.take_snapshot()
+    else:
+        # Xoá sau khi khởi động luồng lấy mẫu để không tính bộ nhớ của chính luồng đó
+        baseline = None
+        tracemalloc.clear_traces()
+        tracemalloc.reset_peak()
+    try:
+        result = func(*args)
+        sampler.stop()
+        sampler.capture() # lần chạy ngắn hơn `interval`: chụp ở cuối nếu bộ nhớ vẫn cao hơn
+        _, peak = tracemalloc.get_traced_memory()
+        if peak <= base_peak:
+            # Đỉnh cũ của bên gọi cao hơn mọi thứ trong lần chạy này: dùng mẫu cao nhất
+            peak = max(sampler.snapshot_size, base_current)
+        allocations, sites = top_sites(sampler.snapshot, top, baseline) if sampler.snapshot else (0, [])
+    finally:
+        sampler.stopped.set()
+        sys.setswitchinterval(switch_interval)
+        if not already_tracing:
+            tracemalloc.stop()
+    return result, {'peak_memory': peak - base_current,
+                    'sampled_memory': max(sampler.snapshot_size - base_current, 0),
+                    'allocations': allocations, 'top_allocations': sites}
+
+# ================== Phần 2: Bảng tăng trưởng bộ nhớ theo n ==================
+def format_size(size: float) -> str:
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+def growth_exponent(ns: List[int], peaks: List[int]) -> float:
+    '''
+    Số mũ k trong peak ~ n^k, ước lượng từ n nhỏ nhất và lớn nhất (độ dốc trên thang log-log).
+    Dùng để ngoại suy giới hạn bộ nhớ cho n lớn hơn các n đã đo.
+    '''
+    if len(ns) < 2 or min(peaks) <= 0:
+        return float('nan')
+    return math.log(peaks[-1] / peaks[0]) / math.log(ns[-1] / ns[0])
+
+def scaling_table(algorithms: List[str], ns: List[int], seed: int = 0, top: int = 1) -> List[Dict[str, Any]]:
+    """Đo mọi cặp (solver, n) qua các engine của batch.py, trả về danh sách bản ghi"""
+    import batch
+    batch.load_engines(algorithms)
+    records = []
+    for algorithm in algorithms:
+        for n in ns:
+            job = {'n': n, 'algorithm': algorithm, 'seed': seed, 'params': {}}
+            records.append(batch.run_job(job, memory=True, top=top))
+    return records
+
+def print_scaling_table(records: List[Dict[str, Any]]):
+    ns = sorted({record['n'] for record in records})
+    algorithms = list(dict.fromkeys(record['algorithm'] for record in records))
+    peaks = {(record['algorithm'], record['n']): record['peak_memory'] for record in records}
+
+    print("Đỉnh bộ nhớ (tracemalloc) theo n")
+    print(f"{'Solver':<10} | " + " | ".join(f"{'n=' + str(n):>11}" for n in ns) + f" | {'~n^k':>5}")
+    print("-" * (13 + 14 * len(ns) + 8))
+    for algorithm in algorithms:
+        row = [peaks[(algorithm, n)] for n in ns]
+        print(f"{algorithm:<10} | " + " | ".join(f"{format_size(peak):>11}" for peak in row)
+              + f" | {growth_exponent(ns, row):>5.2f}")
+
+    print(f"\nVị trí cấp phát lớn nhất ở n={ns[-1]}")
+    print(f"{'Solver':<10} | {'Số khối':>9} | Dòng code giữ nhiều bộ nhớ nhất")
+    print("-" * 72)
+    for record in records:
+        if record['n'] != ns[-1]:
+            continue
+        site = record['top_allocations'][0] if record['top_allocations'] else None
+        where = f"{site['site']} ({format_size(site['size'])}, {site['count']} khối)" if site else "-"
+        print(f"{record['algorithm']:<10} | {record['allocations']:>9} | {where}")
+
+# ================== Phần 3: Khối thực thi chính ==================
+if __name__ == "__main__":
+    import batch
+
+    parser = argparse.ArgumentParser(description="Đo đỉnh bộ nhớ, số khối nhớ và vị trí cấp phát của các solver theo n")
+    parser.add_argument('--algorithm', choices=list(batch.ENGINES), nargs='+',
+                        default=['hc', 'sa', 'ga', 'tabu', 'ga-perm', 'mrv', 'csp-mrv'])
+    parser.add_argument('--n', type=int, nargs='+', default=[8, 12, 16],
+                        help="các giá trị n (engine simpleai rất chậm khi n > 16 dưới tracemalloc)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    missing = batch.missing_requirements(args.algorithm)
+    if missing:
+        parser.error(f"chưa cài gói: {', '.join(missing)}")
+    print_scaling_table(scaling_table(args.algorithm, sorted(args.n), args.seed))
@@ -0,0 +1,154 @@
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Dict, List, Sequence, TextIO, Tuple
+
+# Bàn cờ lớn hơn ngưỡng này sẽ chỉ được in tóm tắt (vài hàng đầu/cuối, cửa sổ cột quanh quân hậu)
+LARGE_BOARD = 64
+# Gom các dòng thành từng khối ~64KB trước khi ghi ra file
+WRITE_CHUNK = 1 << 16
+BINARY_MAGIC = b'NQB1'
+
+# ================== Phần 1: Duyệt bàn cờ theo từng hàng ==================
+def queens_by_row(positions: Sequence[int], by_column: bool = False) -> Dict[int, List[int]]:
+    '''
+    Trả về {hàng: [các cột có quân hậu]} với bộ nhớ O(n).
+    - by_column=False: positions[hàng] = cột (bt1, bt2, bt3).
+    - by_column=True:  positions[cột] = hàng (bt4, B3), một hàng có thể có nhiều quân hậu.
+    '''
+    rows = {}
+    for index, value in enumerate(positions):
+        row, col = (value, index) if by_column else (index, value)
+        rows.setdefault(row, []).append(col)
+    return rows
+
+def format_row(n: int, cols: List[int], empty: str = '.', queen: str = 'Q', sep: str = ' ',
+               start: int = 0, end: int = None) -> str:
+    """Một hàng của bàn cờ (chỉ các cột trong [start, end)), O(n) thay vì cộng chuỗi từng ô"""
+    end = n if end is None else end
+    cells = [empty] * (end - start)
+    for col in cols:
+        if start <= col < end:
+            cells[col - start] = queen
+    return sep.join(cells)
+
+class ChunkedWriter:
+    """Gom các dòng nhỏ thành khối lớn rồi mới ghi ra `out`"""
+    def __init__(self, out: TextIO):
+        self.out = out
+        self.lines = []
+        self.size = 0
+
+    def write_line(self, line: str):
+        self.lines.append(line)
+        self.lines.append('\n')
+        self.size += len(line) + 1
+        if self.size >= WRITE_CHUNK:
+            self.flush()
+
+    def flush(self):
+        self.out.write(''.join(self.lines))
+        self.lines = []
+        self.size = 0
+
+# ================== Phần 2: In bàn cờ ==================
+def write_board(positions: Sequence[int], n: int = None, out: TextIO = None, by_column: bool = False,
+                empty: str = '.', queen: str = 'Q', sep: str = ' ', prefix: str = '', suffix: str = '',
+                row_separator: str = None, max_size: int = LARGE_BOARD):
+    '''
+    Ghi bàn cờ ra `out` (mặc định stdout) từng hàng một, không tạo ma trận n x n.
+    - `prefix` / `suffix`: chuỗi định dạng đầu/cuối mỗi hàng, có thể dùng {row}.
+    - `row_separator`: dòng in sau mỗi hàng (nếu có).
+    - n > max_size: chỉ in max_size // 2 hàng đầu và cuối, mỗi hàng max_size cột quanh quân hậu.
+    '''
+    n = len(positions) if n is None else n
+    out = sys.stdout if out is None else out
+    writer = ChunkedWriter(out)
+    rows = queens_by_row(positions, by_column)
+
+    if n <= max_size:
+        shown_rows = range(n)
+    else:
+        half = max_size // 2
+        shown_rows = list(range(half)) + list(range(n - half, n))
+        writer.write_line(f"(Bàn cờ {n}x{n}: chỉ hiển thị {2 * half} hàng, mỗi hàng {max_size} cột quanh quân hậu)")
+
+    previous = -1
+    for row in shown_rows:
+        if row != previous + 1:
+            writer.write_line(f"... ({row - previous - 1} hàng bị ẩn) ...")
+        previous = row
+        cols = rows.get(row, [])
+        if n <= max_size:
+            start, end = 0, n
+        else:
+            center = cols[0] if cols else 0
+            start = min(max(0, center - max_size // 2), n - max_size)
+            end = start + max_size
+        line = format_row(n, cols, empty, queen, sep, start, end)
+        if n > max_size:
+            line = f"[{start}..{end - 1}] {line}"
+        writer.write_line(prefix.format(row=row) + line + suffix.format(row=row))
+        if row_separator is not None:
+            writer.write_line(row_separator)
+    writer.flush()
+
+# ================== Phần 3: Xuất bàn cờ lớn với bộ nhớ O(n) ==================
+def write_csv(positions: Sequence[int], out: TextIO, by_column: bool = False):
+    """Ghi mỗi quân hậu thành một dòng `row,col`"""
+    writer = ChunkedWriter(out)
+    writer.write_line('row,col')
+    for index, value in enumerate(positions):
+        row, col = (value, index) if by_column else (index, value)
+        writer.write_line(f'{row},{col}')
+    writer.flush()
+
+def write_binary(positions: Sequence[int], out: BinaryIO, by_column: bool = False):
+    '''
+    Định dạng nhị phân: BINARY_MAGIC, n (uint32), cờ by_column (uint8),
+    sau đó n số uint32 (little-endian) theo đúng thứ tự của `positions`.
+    '''
+    values = array('I', positions)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    out.write(BINARY_MAGIC + struct.pack('<IB', len(values), int(by_column)))
+    out.write(values.tobytes())
+
+def read_binary(inp: BinaryIO) -> Tuple[List[int], bool]:
+    """Đọc lại file của write_binary, trả về (positions, by_column)"""
+    header = inp.read(len(BINARY_MAGIC) + 5)
+    if header[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+        raise ValueError("Không phải file bàn cờ N-Queens nhị phân")
+    n, by_column = struct.unpack('<IB', header[len(BINARY_MAGIC):])
+    values = array('I')
+    values.frombytes(inp.read(n * values.itemsize))
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tolist(), bool(by_column)
+
+# ================== Phần 4: Khối thực thi chính ==================
+if __name__ == "__main__":
+    import io
+    import os
+    import time
+
+    # Nghiệm dạng hoán vị cho n chẵn không chia 6 dư 2 (công thức cổ điển), đủ để thử bàn cờ lớn
+    N = 10000
+    solution = [(2 * row + 1) % N if row < N // 2 else (2 * (row - N // 2)) % N for row in range(N)]
+
+    write_board([1, 3, 0, 2], sep=' ')
+    print()
+    start_time = time.time()
+    write_board(solution, max_size=16)
+    print(f"Tóm tắt {N}x{N}: {time.time() - start_time:.4f}s")
+
+    start_time = time.time()
+    with open(os.devnull, 'w') as sink:
+        write_board(solution, out=sink, max_size=N)
+    print(f"In đầy đủ {N}x{N} ra {os.devnull}: {time.time() - start_time:.4f}s")
+
+    buffer = io.BytesIO()
+    write_binary(solution, buffer)
+    buffer.seek(0)
+    assert read_binary(buffer) == (solution, False)
+    print(f"Nhị phân: {len(buffer.getvalue()):,} byte")
@@ -0,0 +1,151 @@
+import time
+import multiprocessing
+from array import array
+from multiprocessing import shared_memory
+from typing import Iterator, List, Optional
+
+# ================== Phần 1: Ring buffer trong shared memory ==================
+class SolutionRingBuffer:
+    '''
+    Ring buffer chứa nghiệm N-Queens dạng nén có độ dài cố định trong shared memory:
+    mỗi slot là một nghiệm gồm n số (cột của quân hậu ở từng hàng), kiểu uint8 (n <= 256) hoặc uint16.
+    - Nhiều tiến trình ghi (put), một tiến trình đọc (read_batch / release).
+    - Hết slot trống thì put() chờ: consumer chậm sẽ làm producer chậm lại (backpressure)
+      thay vì dồn hết nghiệm vào RAM.
+    '''
+    def __init__(self, n: int, capacity: int = 4096):
+        self.n = n
+        self.capacity = capacity
+        self.typecode = 'B' if n <= 256 else 'H'
+        self.itemsize = array(self.typecode).itemsize
+        self.slot_size = n * self.itemsize
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, capacity * self.slot_size))
+        self.free_slots = multiprocessing.Semaphore(capacity)
+        self.filled_slots = multiprocessing.Semaphore(0)
+        self.write_lock = multiprocessing.Lock()
+        self.tail = multiprocessing.RawValue('Q', 0) # tổng số nghiệm đã ghi (vị trí ghi = tail % capacity)
+        self.head = 0 # chỉ consumer dùng
+
+    def put(self, solution: List[int]):
+        """Ghi một nghiệm; chờ nếu buffer đầy"""
+        data = array(self.typecode, solution).tobytes()
+        self.free_slots.acquire()
+        with self.write_lock:
+            offset = (self.tail.value % self.capacity) * self.slot_size
+            self.shm.buf[offset:offset + self.slot_size] = data
+            self.tail.value += 1
+            # Báo đã ghi xong ngay trong lock để thứ tự slot đầy trùng với thứ tự ghi
+            self.filled_slots.release()
+
+    def read_batch(self, max_items: int = 1024, timeout: Optional[float] = None):
+        '''
+        Trả về một mảng NumPy (k x n) trỏ thẳng vào shared memory (không sao chép), k <= max_items,
+        hoặc None nếu hết thời gian chờ. Các slot chỉ được trả lại cho producer khi gọi release(k),
+        nên dữ liệu của view chỉ hợp lệ đến lúc đó.
+        '''
+        import numpy as np
+        if not self.filled_slots.acquire(timeout=timeout):
+            return None
+        start = self.head % self.capacity
+        count = 1
+        # Lấy thêm các slot đã đầy liền kề (không vượt quá cuối buffer để view luôn liên tục)
+        while count < max_items and start + count < self.capacity and self.filled_slots.acquire(False):
+            count += 1
+        dtype = np.uint8 if self.typecode == 'B' else np.uint16
+        return np.ndarray((count, self.n), dtype=dtype, buffer=self.shm.buf,
+                          offset=start * self.slot_size)
+
+    def release(self, count: int):
+        """Trả lại `count` slot đã đọc xong cho producer"""
+        self.head += count
+        for _ in range(count):
+            self.free_slots.release()
+
+    def close(self):
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+# ================== Phần 2: Liệt kê nghiệm song song ==================
+def _enumerate_worker(n: int, first_cols: List[int], buffer: SolutionRingBuffer, finished):
+    """Tiến trình con: liệt kê các nghiệm có quân hậu hàng 0 thuộc `first_cols`, ghi thẳng vào buffer"""
+    full = (1 << n) - 1
+    placement = [0] * n
+
+    def place(row, cols, ld, rd):
+        if row == n:
+            buffer.put(placement)
+            return
+        available = full & ~(cols | ld | rd)
+        while available:
+            bit = available & -available
+            available ^= bit
+            placement[row] = bit.bit_length() - 1
+            place(row + 1, cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1)
+
+    for col in first_cols:
+        bit = 1 << col
+        placement[0] = col
+        place(1, bit, (bit << 1) & full, bit >> 1)
+    buffer.close()
+    with finished.get_lock():
+        finished.value += 1
+
+def enumerate_parallel(n: int, workers: Optional[int] = None, capacity: int = 4096,
+                       batch_size: int = 1024) -> Iterator:
+    '''
+    Liệt kê mọi nghiệm bằng nhiều tiến trình; mỗi lần yield một mảng NumPy (k x n) là view
+    vào shared memory (hàng i: cột của quân hậu ở từng hàng). View chỉ hợp lệ đến lần lặp kế tiếp.
+    '''
+    workers = workers or multiprocessing.cpu_count()
+    buffer = SolutionRingBuffer(n, capacity)
+    finished = multiprocessing.Value('i', 0)
+    processes = [multiprocessing.Process(target=_enumerate_worker,
+                                         args=(n, list(range(n))[index::workers], buffer, finished),
+                                         daemon=True)
+                 for index in range(min(workers, n))]
+    for process in processes:
+        process.start()
+    try:
+        while True:
+            view = buffer.read_batch(batch_size, timeout=0.05)
+            if view is None:
+                # Chỉ dừng khi mọi worker đã xong và không còn slot đầy nào
+                if finished.value == len(processes):
+                    if not buffer.filled_slots.acquire(False):
+                        break
+                    buffer.filled_slots.release() # vẫn còn nghiệm: trả lại để đọc ở vòng sau
+                continue
+            count = len(view)
+            yield view
+            view = None
+            buffer.release(count)
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        buffer.unlink()
+        try:
+            buffer.close()
+        except BufferError:
+            pass # consumer vẫn giữ view cuối cùng: bộ nhớ được giải phóng khi view bị huỷ
+
+# ================== Phần 3: Khối thực thi chính ==================
+if __name__ == "__main__":
+    from counting import count_solutions
+
+    print(f"{'N':>3} | {'Số nghiệm':>10} | {'Thời gian (s)':>13} | Nghiệm đầu tiên")
+    print("-" * 60)
+    for N in range(8, 13):
+        start_time = time.time()
+        total = 0
+        first = None
+        for view in enumerate_parallel(N, capacity=1024):
+            if first is None:
+                first = view[0].tolist()
+            total += len(view)
+        elapsed = time.time() - start_time
+        assert total == count_solutions(N)
+        print(f"{N:>3} | {total:>10} | {elapsed:>13.4f} | {first}")
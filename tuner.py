@@ -0,0 +1,135 @@
+import argparse, json, math, os, random, time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple, Dict, Any
+
+import bt4
+
+# ================== Phần 1: Không gian tham số ==================
+# Mỗi tham số: (kiểu lấy mẫu, giá trị nhỏ nhất, giá trị lớn nhất)
+SEARCH_SPACES = {
+    'SA': {
+        'initial_temp': ('log', 1.0, 1000.0),
+        'cooling_rate': ('float', 0.9, 0.9999),
+        'min_temp': ('log', 0.001, 1.0),
+    },
+    'GA': {
+        'population_size': ('int', 10, 200),
+        'mutation_rate': ('float', 0.01, 0.5),
+        'tournament_size': ('int', 2, 7),
+    },
+}
+GA_GENERATIONS = 300 # số thế hệ tối đa cho mỗi lần chạy GA khi tinh chỉnh
+
+def sample_params(solver: str, rng: random.Random) -> Dict[str, Any]:
+    """Lấy ngẫu nhiên một cấu hình trong không gian tham số của solver"""
+    params = {}
+    for name, (kind, low, high) in SEARCH_SPACES[solver].items():
+        if kind == 'int':
+            params[name] = rng.randint(low, high)
+        elif kind == 'log':
+            params[name] = math.exp(rng.uniform(math.log(low), math.log(high)))
+        else:
+            params[name] = rng.uniform(low, high)
+    return params
+
+# ================== Phần 2: Chạy thử một cấu hình ==================
+def run_trial(solver: str, n: int, params: Dict[str, Any], seed: int) -> Tuple[bool, float]:
+    """Chạy solver một lần với params, trả về (thành công, thời gian)"""
+    random.seed(seed)
+    start_time = time.time()
+    if solver == 'SA':
+        _, conflicts, _ = bt4.SimulatedAnnealingWithValueOrdering(n).solve(**params)
+    else:
+        _, conflicts, _ = bt4.GeneticAlgorithmWithValueOrdering(n, **params).solve(generations=GA_GENERATIONS)
+    return conflicts == 0, time.time() - start_time
+
+def expected_time(successes: int, total_time: float) -> float:
+    """
+    Thời gian kỳ vọng để có một nghiệm khi chạy lại đến lúc thành công:
+    tổng thời gian / số lần thành công (vô cùng nếu chưa lần nào thành công)
+    """
+    return total_time / successes if successes else float('inf')
+
+# ================== Phần 3: Successive halving ==================
+def tune(solver: str, n: int, configs: int = 16, min_trials: int = 2, eta: int = 2,
+         workers: int = None, seed: int = 0) -> Dict[str, Any]:
+    '''
+    Successive halving: bắt đầu với `configs` cấu hình ngẫu nhiên, mỗi cấu hình chạy `min_trials` lần.
+    Sau mỗi vòng chỉ giữ lại 1/eta cấu hình tốt nhất và chạy thêm gấp eta lần,
+    cho đến khi còn một cấu hình. Các lần chạy được phân phối trên một process pool.
+    '''
+    rng = random.Random(seed)
+    candidates = [sample_params(solver, rng) for _ in range(configs - 1)]
+    # Luôn so sánh với tham số mặc định hiện tại
+    candidates.append(dict(bt4.SA_DEFAULTS if solver == 'SA' else bt4.GA_DEFAULTS))
+    # Thống kê tích luỹ cho từng cấu hình: [số lần chạy, số lần thành công, tổng thời gian]
+    stats = [[0, 0, 0.0] for _ in candidates]
+    alive = list(range(len(candidates)))
+    trials = min_trials
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            jobs = []
+            for index in alive:
+                for _ in range(trials - stats[index][0]):
+                    trial_seed = rng.randrange(2 ** 32)
+                    jobs.append((index, pool.submit(run_trial, solver, n, candidates[index], trial_seed)))
+            for index, job in jobs:
+                success, elapsed = job.result()
+                stats[index][0] += 1
+                stats[index][1] += success
+                stats[index][2] += elapsed
+
+            # Xếp hạng: thời gian kỳ vọng để có nghiệm, rồi tỷ lệ thành công
+            alive.sort(key=lambda i: (expected_time(stats[i][1], stats[i][2]), -stats[i][1] / stats[i][0]))
+            if len(alive) == 1:
+                break
+            alive = alive[:max(1, len(alive) // eta)]
+            trials *= eta
+
+    best = alive[0]
+    runs, successes, total_time = stats[best]
+    return {
+        'params': candidates[best],
+        'success_rate': successes / runs,
+        'mean_time': total_time / runs,
+        'expected_time': expected_time(successes, total_time),
+        'trials': runs,
+    }
+
+# ================== Phần 4: Lưu kết quả ==================
+def save_tuned_params(solver: str, n: int, result: Dict[str, Any], path: str = bt4.TUNED_PARAMS_FILE):
+    """Ghi cấu hình tốt nhất cho (solver, n); bt4 tự đọc lại file này làm tham số mặc định"""
+    data = {}
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    data.setdefault(solver, {})[str(n)] = result
+    # Ghi ra file tạm rồi đổi tên để bt4 không bao giờ đọc phải file ghi dở
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+# ================== Phần 5: Khối thực thi chính ==================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tinh chỉnh tham số SA / GA cho N-Queens theo từng n")
+    parser.add_argument('--solver', choices=sorted(SEARCH_SPACES), nargs='+', default=['SA', 'GA'])
+    parser.add_argument('--n', type=int, nargs='+', default=[8])
+    parser.add_argument('--configs', type=int, default=16, help="số cấu hình ban đầu")
+    parser.add_argument('--trials', type=int, default=2, help="số lần chạy mỗi cấu hình ở vòng đầu")
+    parser.add_argument('--workers', type=int, default=None, help="số tiến trình (mặc định: số nhân CPU)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'Solver':<6} {'n':>4} | {'Thành công':>10} | {'TG kỳ vọng (s)':>14} | Tham số")
+    print("-" * 80)
+    for solver in args.solver:
+        for n in args.n:
+            result = tune(solver, n, configs=args.configs, min_trials=args.trials,
+                          workers=args.workers, seed=args.seed)
+            save_tuned_params(solver, n, result)
+            params = ", ".join(f"{name}={value:.4g}" for name, value in result['params'].items())
+            print(f"{solver:<6} {n:>4} | {result['success_rate']:>10.0%} | "
+                  f"{result['expected_time']:>14.4f} | {params}")
+    print(f"\nĐã lưu vào {bt4.TUNED_PARAMS_FILE}")